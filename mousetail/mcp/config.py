@@ -0,0 +1,39 @@
+"""Server configuration read from config.json.
+
+The file lives in the project root. Only the standard library is imported
+here, so the server, the daemon and the tools can all read settings without
+pulling in each other's dependencies.
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+CONFIG_PATH = Path(__file__).parent.parent.parent / "config.json"
+
+# (mtime, parsed config) of the last config.json read
+_config_cache: Optional[tuple] = None
+
+
+def load_config() -> dict:
+    """Load configuration from config.json.
+
+    The parsed file is cached and only re-read when its modification time
+    changes. Treat the result as read-only.
+
+    Returns:
+        Dict with configuration data, or empty dict if file doesn't exist.
+    """
+    global _config_cache
+    try:
+        if CONFIG_PATH.exists():
+            mtime = CONFIG_PATH.stat().st_mtime_ns
+            if _config_cache is not None and _config_cache[0] == mtime:
+                return _config_cache[1]
+            with open(CONFIG_PATH, 'r') as f:
+                config = json.load(f)
+            _config_cache = (mtime, config)
+            return config
+    except Exception:
+        pass
+    return {}
@@ -0,0 +1,179 @@
+"""Persistent MCP server listening on a Unix domain socket.
+
+The daemon runs one AnkiMCPServer, and so one CollectionManager, for every
+connection it accepts. Each connection speaks the same newline-delimited
+JSON-RPC as the stdio transport, which lets mousetail.mcp.shim relay a client's
+stdio session to it unchanged. Collections stay open and caches stay warm
+between sessions, and concurrent sessions share the one open collection rather
+than fighting over Anki's SQLite lock.
+
+The daemon exits after ``daemon.idle_timeout`` seconds without connections,
+releasing the collections so Anki itself can open them again.
+"""
+
+import fcntl
+import logging
+import os
+import time
+from pathlib import Path
+
+_import_started = time.perf_counter()
+
+import anyio
+from anyio.streams.buffered import BufferedByteReceiveStream
+from mcp import types
+from mcp.shared.message import SessionMessage
+
+from mousetail.mcp.server import AnkiMCPServer
+from mousetail.mcp.shim import default_socket_path
+from mousetail.mcp.config import load_config
+
+_import_ms = round((time.perf_counter() - _import_started) * 1000, 1)
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+DEFAULT_IDLE_TIMEOUT = 600
+
+
+class MCPDaemon:
+    """Serve one AnkiMCPServer to many clients over a Unix domain socket.
+
+    Attributes:
+        socket_path: Path the daemon listens on.
+        idle_timeout: Seconds without connections before the daemon exits,
+            or None to run until stopped.
+        anki_server: The server shared by every connection.
+        connections: Number of currently open connections.
+    """
+
+    def __init__(self, socket_path: Path, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """Initialize the daemon.
+
+        Args:
+            socket_path: Path to listen on.
+            idle_timeout: Seconds without connections before exiting, or None.
+        """
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.anki_server = AnkiMCPServer()
+        self.connections = 0
+        self._last_active = time.monotonic()
+
+    async def handle_connection(self, stream):
+        """Run an MCP session over one client connection.
+
+        Args:
+            stream: The accepted socket stream.
+        """
+        server = self.anki_server.get_server()
+        read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+        write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+        buffered = BufferedByteReceiveStream(stream)
+
+        async def socket_reader():
+            async with read_stream_writer:
+                while True:
+                    try:
+                        line = await buffered.receive_until(b"\n", MAX_MESSAGE_BYTES)
+                    except (anyio.EndOfStream, anyio.IncompleteRead, anyio.BrokenResourceError):
+                        return
+                    if not line.strip():
+                        continue
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(line)
+                    except Exception as exc:
+                        await read_stream_writer.send(exc)
+                        continue
+                    await read_stream_writer.send(SessionMessage(message))
+
+        async def socket_writer():
+            try:
+                async with write_stream_reader:
+                    async for session_message in write_stream_reader:
+                        json = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                        await stream.send((json + "\n").encode("utf-8"))
+            except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+                await anyio.lowlevel.checkpoint()
+
+        self.connections += 1
+        logger.info(f"Client connected ({self.connections} open)")
+        try:
+            async with stream, anyio.create_task_group() as tg:
+                tg.start_soon(socket_reader)
+                tg.start_soon(socket_writer)
+                await server.run(read_stream, write_stream, server.create_initialization_options())
+                tg.cancel_scope.cancel()
+        except Exception as e:
+            # One broken connection must not take the daemon down with it
+            logger.error(f"Connection failed: {e}", exc_info=True)
+        finally:
+            self.connections -= 1
+            self._last_active = time.monotonic()
+            logger.info(f"Client disconnected ({self.connections} open)")
+
+    async def _exit_when_idle(self, scope: anyio.CancelScope):
+        """Cancel the daemon once it has had no connections for idle_timeout."""
+        while True:
+            await anyio.sleep(min(self.idle_timeout, 30))
+            idle = time.monotonic() - self._last_active
+            if self.connections == 0 and idle >= self.idle_timeout:
+                logger.info(f"No clients for {round(idle)} s, shutting down")
+                scope.cancel()
+                return
+
+    async def serve(self):
+        """Listen on the socket until cancelled or idle."""
+        listener = await anyio.create_unix_listener(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Listening on {self.socket_path}")
+        try:
+            async with listener, anyio.create_task_group() as tg:
+                if self.idle_timeout:
+                    tg.start_soon(self._exit_when_idle, tg.cancel_scope)
+                await listener.serve(self.handle_connection, task_group=tg)
+        finally:
+            self.anki_server.manager.close_all()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def run(socket_path=None):
+    """Run the daemon unless another one already owns the socket.
+
+    A lock file next to the socket makes sure only one daemon serves a given
+    path, even when several shims start one at the same moment.
+
+    Args:
+        socket_path: Path to listen on. Defaults to the shim's default path.
+    """
+    socket_path = Path(socket_path) if socket_path else default_socket_path()
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    lock_file = open(socket_path.with_name(socket_path.name + ".lock"), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        logger.info(f"Another mousetail daemon is already serving {socket_path}")
+        lock_file.close()
+        return
+
+    # Holding the lock means any socket file left behind is stale
+    if socket_path.exists():
+        socket_path.unlink()
+
+    idle_timeout = load_config().get("daemon", {}).get("idle_timeout", DEFAULT_IDLE_TIMEOUT)
+    daemon = MCPDaemon(socket_path, idle_timeout=idle_timeout)
+    daemon.anki_server.manager.timings['server_import_ms'] = _import_ms
+    logger.info(f"Server modules imported in {_import_ms} ms")
+
+    try:
+        anyio.run(daemon.serve)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lock_file.close()
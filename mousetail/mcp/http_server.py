@@ -0,0 +1,114 @@
+"""MCP server with Streamable HTTP transport for sharing one server between clients.
+
+Unlike the stdio transport, where every client launches its own process, this
+runs a single AnkiMCPServer (and so a single CollectionManager) that any number
+of MCP clients can connect to at once. Collections stay open and caches stay
+warm between sessions, and clients never race each other for Anki's SQLite lock.
+"""
+
+import contextlib
+import logging
+import time
+
+_import_started = time.perf_counter()
+
+import uvicorn
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from mcp.server.transport_security import TransportSecuritySettings
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from mousetail.mcp.server import AnkiMCPServer
+
+_import_ms = round((time.perf_counter() - _import_started) * 1000, 1)
+
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+MCP_PATH = "/mcp"
+
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def _security_settings(host: str, port: int) -> TransportSecuritySettings:
+    """Build DNS rebinding protection for the address being served.
+
+    When bound to loopback, only requests addressed to loopback are accepted,
+    so a web page can't reach the server through a rebound domain name.
+    Binding to any other address disables the check; put the server behind
+    your own proxy in that case.
+
+    Args:
+        host: Interface the server listens on.
+        port: Port the server listens on.
+
+    Returns:
+        TransportSecuritySettings for the session manager.
+    """
+    if host not in LOOPBACK_HOSTS:
+        return TransportSecuritySettings(enable_dns_rebinding_protection=False)
+
+    hosts = [f"{name}:{port}" for name in ("127.0.0.1", "localhost", "[::1]")]
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True,
+        allowed_hosts=hosts,
+        allowed_origins=[f"http://{h}" for h in hosts],
+    )
+
+
+class _MCPEndpoint:
+    """ASGI endpoint handing requests to the session manager."""
+
+    def __init__(self, session_manager: StreamableHTTPSessionManager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope, receive, send):
+        await self.session_manager.handle_request(scope, receive, send)
+
+
+def create_app(anki_server: AnkiMCPServer, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> Starlette:
+    """Create the ASGI application serving MCP at ``/mcp``.
+
+    Args:
+        anki_server: The server shared by every client session.
+        host: Interface the app will be served on.
+        port: Port the app will be served on.
+
+    Returns:
+        Starlette application; serve it with any ASGI server.
+    """
+    session_manager = StreamableHTTPSessionManager(
+        app=anki_server.get_server(),
+        security_settings=_security_settings(host, port),
+    )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            try:
+                yield
+            finally:
+                anki_server.manager.close_all()
+
+    return Starlette(routes=[Route(MCP_PATH, endpoint=_MCPEndpoint(session_manager))], lifespan=lifespan)
+
+
+def run(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """Run the MCP server with Streamable HTTP transport.
+
+    Args:
+        host: Interface to listen on. Defaults to loopback only.
+        port: Port to listen on.
+    """
+    logger.info(f"Starting Anki MCP Server on http://{host}:{port}{MCP_PATH}")
+
+    anki_server = AnkiMCPServer()
+    anki_server.manager.timings['server_import_ms'] = _import_ms
+    logger.info(f"Server modules imported in {_import_ms} ms")
+    logger.info(f"Allowing {anki_server.max_concurrent_requests} concurrent tool calls per client")
+
+    app = create_app(anki_server, host, port)
+    uvicorn.run(app, host=host, port=port, log_level="info")
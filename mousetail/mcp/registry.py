@@ -0,0 +1,1034 @@
+"""Declarative registry of MCP tools.
+
+Each tool is declared exactly once here with its description, input schema
+and handler. The server builds its tool list and dispatch table from this
+registry at startup, and generate_docs.py reads it to produce the tool
+reference, so adding a tool only means adding an entry to TOOLS.
+"""
+
+from typing import Any, Awaitable, Callable, Optional
+
+from jsonschema.validators import validator_for
+
+from mousetail.mcp.tools import (
+    list_collections_tool,
+    get_collection_info_tool,
+    get_collection_stats_tool,
+    list_decks_tool,
+    create_deck_tool,
+    list_note_types_tool,
+    create_note_tool,
+    create_notes_tool,
+    search_notes_tool,
+    fulltext_search_tool,
+    similar_notes_tool,
+    get_note_tool,
+    get_notes_tool,
+    update_note_tool,
+    update_notes_tool,
+    find_duplicates_tool,
+    add_tags_tool,
+    remove_tags_tool,
+    replace_tags_tool,
+    rename_tag_tool,
+    list_tags_tool,
+    move_cards_tool,
+    suspend_cards_tool,
+    unsuspend_cards_tool,
+    delete_notes_tool,
+    export_notes_tool,
+    import_notes_tool,
+    job_status_tool,
+    save_sync_credentials_tool,
+    load_sync_credentials_tool,
+    delete_sync_credentials_tool,
+    sync_collection_tool,
+    start_sync_tool,
+    sync_status_tool,
+)
+
+
+# Schema shared by every tool that accepts an optional collection path
+COLLECTION_PATH = {
+    "type": "string",
+    "description": "Path to collection file (optional)"
+}
+
+
+class ToolDefinition:
+    """A single MCP tool: its schema and the coroutine that implements it.
+
+    Handlers are called with the validated arguments as keyword arguments,
+    so their parameter names must match the schema's property names.
+
+    Attributes:
+        name: Tool name exposed to MCP clients.
+        description: Human-readable description of the tool.
+        input_schema: JSON Schema for the tool's arguments.
+        handler: Async function implementing the tool.
+        parameters: Property names accepted by the handler.
+        validator: Precompiled JSON Schema validator for the arguments.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        input_schema: dict[str, Any],
+        handler: Callable[..., Awaitable[dict]]
+    ):
+        self.name = name
+        self.description = description
+        self.input_schema = input_schema
+        self.handler = handler
+        self.parameters = frozenset(input_schema.get("properties", {}))
+
+        validator_class = validator_for(input_schema)
+        validator_class.check_schema(input_schema)
+        self.validator = validator_class(input_schema)
+
+    def validate(self, arguments: dict[str, Any]) -> Optional[str]:
+        """Validate arguments against the tool's input schema.
+
+        Returns:
+            Error message, or None if the arguments are valid
+        """
+        error = next(self.validator.iter_errors(arguments), None)
+        if error is not None:
+            return f"Input validation error: {error.message}"
+        return None
+
+    async def call(self, arguments: dict[str, Any]) -> dict:
+        """Run the tool's handler with already validated arguments."""
+        return await self.handler(**{
+            key: value for key, value in arguments.items() if key in self.parameters
+        })
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the tool definition in MCP's JSON form (used for docs)."""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "inputSchema": self.input_schema
+        }
+
+
+TOOLS: list[ToolDefinition] = [
+    ToolDefinition(
+        name="list_collections",
+        description="List all available Anki collections on the system",
+        input_schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        },
+        handler=list_collections_tool,
+    ),
+    ToolDefinition(
+        name="get_collection_info",
+        description="Get information about an Anki collection (name, card count, note count)",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "collection_path": {
+                    "type": "string",
+                    "description": "Path to collection file (optional, uses default if not provided)"
+                }
+            },
+            "required": []
+        },
+        handler=get_collection_info_tool,
+    ),
+    ToolDefinition(
+        name="get_collection_stats",
+        description="Get memory, file handle and cache statistics for the open collections, "
+                    "and the limits on how many stay open",
+        input_schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        },
+        handler=get_collection_stats_tool,
+    ),
+    ToolDefinition(
+        name="list_decks",
+        description="List all decks in the collection with their names and IDs",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=list_decks_tool,
+    ),
+    ToolDefinition(
+        name="create_deck",
+        description="Create a new deck in the collection",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "deck_name": {
+                    "type": "string",
+                    "description": "Name of the deck to create"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["deck_name"]
+        },
+        handler=create_deck_tool,
+    ),
+    ToolDefinition(
+        name="list_note_types",
+        description="List all note types (card templates) available in the collection",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=list_note_types_tool,
+    ),
+    ToolDefinition(
+        name="create_note",
+        description="Create a new note (flashcard) in Anki. A note generates one or more cards based on the note type template.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "deck_name": {
+                    "type": "string",
+                    "description": "Name of the deck where the note should be added"
+                },
+                "note_type_name": {
+                    "type": "string",
+                    "description": "Name of the note type (e.g., 'Basic', 'Cloze')"
+                },
+                "fields": {
+                    "type": "object",
+                    "description": "Field name to value mapping (e.g., {'Front': 'Question', 'Back': 'Answer'})",
+                    "additionalProperties": {
+                        "type": "string"
+                    }
+                },
+                "tags": {
+                    "type": "array",
+                    "description": "Optional list of tags",
+                    "items": {"type": "string"},
+                    "default": []
+                },
+                "on_duplicate": {
+                    "type": "string",
+                    "enum": ["allow", "skip", "upsert"],
+                    "description": "If a note of the same type with the same first field exists: add anyway (allow), leave it alone (skip), or update its fields and add the tags (upsert)",
+                    "default": "allow"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["deck_name", "note_type_name", "fields"]
+        },
+        handler=create_note_tool,
+    ),
+    ToolDefinition(
+        name="create_notes",
+        description="Create many notes (flashcards) in one batch. All notes are added in a single transaction; each item reports its own success or error.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "notes": {
+                    "type": "array",
+                    "description": "List of notes to create",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "deck_name": {
+                                "type": "string",
+                                "description": "Name of the deck where the note should be added"
+                            },
+                            "note_type_name": {
+                                "type": "string",
+                                "description": "Name of the note type (e.g., 'Basic', 'Cloze')"
+                            },
+                            "fields": {
+                                "type": "object",
+                                "description": "Field name to value mapping",
+                                "additionalProperties": {
+                                    "type": "string"
+                                }
+                            },
+                            "tags": {
+                                "type": "array",
+                                "description": "Optional list of tags",
+                                "items": {"type": "string"}
+                            }
+                        },
+                        "required": ["deck_name", "note_type_name", "fields"]
+                    }
+                },
+                "on_duplicate": {
+                    "type": "string",
+                    "enum": ["allow", "skip", "upsert"],
+                    "description": "If a note duplicates an existing one (same type and first field): add anyway (allow), skip it (skip), or update the existing note (upsert). Duplicates within the batch are skipped unless allow",
+                    "default": "allow"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["notes"]
+        },
+        handler=create_notes_tool,
+    ),
+    ToolDefinition(
+        name="search_notes",
+        description="Search for notes using Anki search syntax. Examples: 'deck:MyDeck', 'tag:important', 'front:*python*'. Results are paged: pass next_cursor back to fetch the next page.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (optional)",
+                    "default": 100
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Number of results to skip (optional)",
+                    "default": 0
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": "next_cursor value from a previous call with the same query, order and reverse (optional)"
+                },
+                "order": {
+                    "type": "string",
+                    "description": "Browser column to sort by, e.g. 'noteCrt' (created), 'noteMod' (modified), 'noteFld' (sort field), 'deck', 'noteTags' (optional, unordered if omitted)"
+                },
+                "reverse": {
+                    "type": "boolean",
+                    "description": "Reverse the sort order (optional)",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["query"]
+        },
+        handler=search_notes_tool,
+    ),
+    ToolDefinition(
+        name="fulltext_search",
+        description="Search the text of notes, ranked by relevance (BM25) with a snippet of each match. Faster than search_notes for words anywhere in a note; uses a full-text index kept next to the collection. Accepts plain words or FTS5 syntax: 'python AND NOT snake', '\"exact phrase\"', 'pyth*', 'first: python'.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Words to find, or an FTS5 query"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (optional)",
+                    "default": 20
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Number of results to skip (optional)",
+                    "default": 0
+                },
+                "filter_query": {
+                    "type": "string",
+                    "description": "Only return notes also matching this Anki search query, e.g. 'deck:MyDeck' (optional)"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["query"]
+        },
+        handler=fulltext_search_tool,
+    ),
+    ToolDefinition(
+        name="similar_notes",
+        description="Find the notes most similar to a note or to some text (TF-IDF cosine similarity, computed locally). Use it to find near-duplicates (min_similarity around 0.8) or related notes without reading whole decks.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "integer",
+                    "description": "Note to find neighbours of (give this or text)"
+                },
+                "text": {
+                    "type": "string",
+                    "description": "Text to find neighbours of (give this or note_id)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (optional)",
+                    "default": 10
+                },
+                "min_similarity": {
+                    "type": "number",
+                    "description": "Leave out notes less similar than this, from 0 to 1 (optional)",
+                    "default": 0.0
+                },
+                "filter_query": {
+                    "type": "string",
+                    "description": "Only return notes also matching this Anki search query, e.g. 'deck:MyDeck' (optional)"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=similar_notes_tool,
+    ),
+    ToolDefinition(
+        name="get_note",
+        description="Get detailed information about a specific note by ID",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "integer",
+                    "description": "ID of the note to retrieve"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["note_id"]
+        },
+        handler=get_note_tool,
+    ),
+    ToolDefinition(
+        name="get_notes",
+        description="Get information about many notes at once, selected by ID list or search query. Fields and attributes to return can be chosen to keep responses small.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "note_ids": {
+                    "type": "array",
+                    "description": "IDs of the notes to retrieve (optional if query is given)",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the notes (used when note_ids is not given)"
+                },
+                "fields": {
+                    "type": "array",
+                    "description": "Field names to return (optional, returns all fields if omitted, none if empty)",
+                    "items": {"type": "string"}
+                },
+                "attributes": {
+                    "type": "array",
+                    "description": "Note attributes to return (optional, returns all if omitted)",
+                    "items": {
+                        "type": "string",
+                        "enum": ["guid", "note_type", "deck", "tags", "card_ids", "modified"]
+                    }
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of notes to return for a query (optional)",
+                    "default": 100
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=get_notes_tool,
+    ),
+    ToolDefinition(
+        name="update_note",
+        description="Update an existing note's fields and/or tags",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "note_id": {
+                    "type": "integer",
+                    "description": "ID of the note to update"
+                },
+                "fields": {
+                    "type": "object",
+                    "description": "Field name to value mapping for fields to update",
+                    "additionalProperties": {
+                        "type": "string"
+                    }
+                },
+                "tags": {
+                    "type": "array",
+                    "description": "New list of tags (replaces existing tags)",
+                    "items": {"type": "string"}
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["note_id"]
+        },
+        handler=update_note_tool,
+    ),
+    ToolDefinition(
+        name="update_notes",
+        description="Patch fields of many notes at once (set, append, prepend, regex or find-and-replace) in one transaction, with a dry-run mode that only reports the changes",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "patches": {
+                    "type": "array",
+                    "description": "Patch operations, applied in order",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "op": {
+                                "type": "string",
+                                "enum": ["set", "append", "prepend", "regex", "find_replace"],
+                                "description": "Operation to apply"
+                            },
+                            "field": {
+                                "type": "string",
+                                "description": "Field to patch (optional for find_replace, which defaults to every field)"
+                            },
+                            "value": {
+                                "type": "string",
+                                "description": "Text for set, append and prepend"
+                            },
+                            "pattern": {
+                                "type": "string",
+                                "description": "Python regular expression for regex"
+                            },
+                            "search": {
+                                "type": "string",
+                                "description": "Text (or regex, if 'regex' is true) to find for find_replace"
+                            },
+                            "replacement": {
+                                "type": "string",
+                                "description": "Replacement for regex (\\1 groups) and find_replace ($1 groups)"
+                            },
+                            "regex": {
+                                "type": "boolean",
+                                "description": "Treat find_replace's search as a regular expression"
+                            },
+                            "match_case": {
+                                "type": "boolean",
+                                "description": "Make find_replace case sensitive"
+                            },
+                            "ignore_case": {
+                                "type": "boolean",
+                                "description": "Make regex case insensitive"
+                            }
+                        },
+                        "required": ["op"]
+                    }
+                },
+                "note_ids": {
+                    "type": "array",
+                    "description": "IDs of the notes to patch",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the notes (used when note_ids is not given)"
+                },
+                "dry_run": {
+                    "type": "boolean",
+                    "description": "Only report what would change, with a sample of the changes",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["patches"]
+        },
+        handler=update_notes_tool,
+    ),
+    ToolDefinition(
+        name="find_duplicates",
+        description="Find groups of notes with the same note type and first field (ignoring HTML, case and whitespace)",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "note_type": {
+                    "type": "string",
+                    "description": "Only report duplicates of this note type (optional)"
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Only consider notes matching this Anki search query (optional)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of groups to return, largest first",
+                    "default": 50
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=find_duplicates_tool,
+    ),
+    ToolDefinition(
+        name="add_tags",
+        description="Add tags to all notes matching a search query or list of IDs in one operation",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "tags": {
+                    "type": "array",
+                    "description": "Tags to add",
+                    "items": {"type": "string"}
+                },
+                "note_ids": {
+                    "type": "array",
+                    "description": "IDs of the notes to tag",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the notes (used when note_ids is not given)"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["tags"]
+        },
+        handler=add_tags_tool,
+    ),
+    ToolDefinition(
+        name="remove_tags",
+        description="Remove tags from all notes matching a search query or list of IDs in one operation",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "tags": {
+                    "type": "array",
+                    "description": "Tags to remove (case-insensitive; child tags are removed too)",
+                    "items": {"type": "string"}
+                },
+                "note_ids": {
+                    "type": "array",
+                    "description": "IDs of the notes to untag",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the notes (used when note_ids is not given)"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["tags"]
+        },
+        handler=remove_tags_tool,
+    ),
+    ToolDefinition(
+        name="replace_tags",
+        description="Find and replace text within the tags of all notes matching a search query or list of IDs",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "search": {
+                    "type": "string",
+                    "description": "Text (or regular expression) to find in each tag"
+                },
+                "replacement": {
+                    "type": "string",
+                    "description": "Replacement text; a tag replaced by an empty string is removed"
+                },
+                "note_ids": {
+                    "type": "array",
+                    "description": "IDs of the notes to change",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the notes (used when note_ids is not given)"
+                },
+                "regex": {
+                    "type": "boolean",
+                    "description": "Treat search as a regular expression ($1 refers to groups)",
+                    "default": False
+                },
+                "match_case": {
+                    "type": "boolean",
+                    "description": "Match case-sensitively",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["search", "replacement"]
+        },
+        handler=replace_tags_tool,
+    ),
+    ToolDefinition(
+        name="rename_tag",
+        description="Rename a tag and its child tags on every note in the collection",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "old_tag": {
+                    "type": "string",
+                    "description": "Tag to rename"
+                },
+                "new_tag": {
+                    "type": "string",
+                    "description": "New tag name"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["old_tag", "new_tag"]
+        },
+        handler=rename_tag_tool,
+    ),
+    ToolDefinition(
+        name="list_tags",
+        description="List the collection's tags with the number of notes carrying each",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "prefix": {
+                    "type": "string",
+                    "description": "Only list tags starting with this text, e.g. 'lang::' (optional)"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=list_tags_tool,
+    ),
+    ToolDefinition(
+        name="move_cards",
+        description="Move all cards matching a search query or list of IDs to a deck, in chunks of one backend operation each",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "deck_name": {
+                    "type": "string",
+                    "description": "Name of the destination deck"
+                },
+                "card_ids": {
+                    "type": "array",
+                    "description": "IDs of the cards to move",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the cards (used when card_ids is not given)"
+                },
+                "background": {
+                    "type": "boolean",
+                    "description": "Return a job straight away and report progress through job_status",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["deck_name"]
+        },
+        handler=move_cards_tool,
+    ),
+    ToolDefinition(
+        name="suspend_cards",
+        description="Suspend all cards matching a search query or list of IDs, in chunks of one backend operation each",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "card_ids": {
+                    "type": "array",
+                    "description": "IDs of the cards to suspend",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the cards (used when card_ids is not given)"
+                },
+                "background": {
+                    "type": "boolean",
+                    "description": "Return a job straight away and report progress through job_status",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=suspend_cards_tool,
+    ),
+    ToolDefinition(
+        name="unsuspend_cards",
+        description="Unsuspend all cards matching a search query or list of IDs, in chunks of one backend operation each",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "card_ids": {
+                    "type": "array",
+                    "description": "IDs of the cards to unsuspend",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the cards (used when card_ids is not given)"
+                },
+                "background": {
+                    "type": "boolean",
+                    "description": "Return a job straight away and report progress through job_status",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=unsuspend_cards_tool,
+    ),
+    ToolDefinition(
+        name="delete_notes",
+        description="Delete all notes (and their cards) matching a search query or list of IDs, in chunks of one backend operation each",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "note_ids": {
+                    "type": "array",
+                    "description": "IDs of the notes to delete",
+                    "items": {"type": "integer"}
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the notes (used when note_ids is not given)"
+                },
+                "background": {
+                    "type": "boolean",
+                    "description": "Return a job straight away and report progress through job_status",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=delete_notes_tool,
+    ),
+    ToolDefinition(
+        name="export_notes",
+        description="Export all notes matching a search query to a JSONL or CSV file, streamed in chunks",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Anki search query selecting the notes (e.g., 'deck:Spanish')"
+                },
+                "output_path": {
+                    "type": "string",
+                    "description": "File to write"
+                },
+                "file_format": {
+                    "type": "string",
+                    "enum": ["jsonl", "csv"],
+                    "description": "File format (optional, taken from the file extension if not provided)"
+                },
+                "chunk_size": {
+                    "type": "integer",
+                    "description": "Notes read per chunk",
+                    "default": 1000
+                },
+                "overwrite": {
+                    "type": "boolean",
+                    "description": "Replace the file if it exists",
+                    "default": False
+                },
+                "background": {
+                    "type": "boolean",
+                    "description": "Return a job straight away and report progress through job_status",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["query", "output_path"]
+        },
+        handler=export_notes_tool,
+    ),
+    ToolDefinition(
+        name="import_notes",
+        description="Import notes from a JSONL or CSV file in chunked transactions, resuming an interrupted import from its checkpoint",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "input_path": {
+                    "type": "string",
+                    "description": "File to import"
+                },
+                "note_type": {
+                    "type": "string",
+                    "description": "Note type for every row (optional if the file has a note_type column)"
+                },
+                "deck_name": {
+                    "type": "string",
+                    "description": "Deck for every row (optional if the file has a deck column)"
+                },
+                "field_map": {
+                    "type": "object",
+                    "description": "Column name to field name mapping (optional, columns are field names if not provided)",
+                    "additionalProperties": {
+                        "type": "string"
+                    }
+                },
+                "file_format": {
+                    "type": "string",
+                    "enum": ["jsonl", "csv"],
+                    "description": "File format (optional, taken from the file extension if not provided)"
+                },
+                "chunk_size": {
+                    "type": "integer",
+                    "description": "Rows added per transaction",
+                    "default": 500
+                },
+                "resume": {
+                    "type": "boolean",
+                    "description": "Continue an interrupted import of the same file from its checkpoint",
+                    "default": True
+                },
+                "error_path": {
+                    "type": "string",
+                    "description": "File for rows that failed (optional, defaults to <input_path>.errors.jsonl)"
+                },
+                "background": {
+                    "type": "boolean",
+                    "description": "Return a job straight away and report progress through job_status",
+                    "default": False
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": ["input_path"]
+        },
+        handler=import_notes_tool,
+    ),
+    ToolDefinition(
+        name="save_sync_credentials",
+        description="Save sync credentials securely to system keychain (macOS Keychain, Windows Credential Manager, or Linux Secret Service)",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "username": {
+                    "type": "string",
+                    "description": "AnkiWeb ID or sync server username"
+                },
+                "password": {
+                    "type": "string",
+                    "description": "Account password"
+                },
+                "endpoint": {
+                    "type": "string",
+                    "description": "Sync server URL (optional). Leave empty for AnkiWeb. Example: https://sync.example.com"
+                }
+            },
+            "required": ["username", "password"]
+        },
+        handler=save_sync_credentials_tool,
+    ),
+    ToolDefinition(
+        name="load_sync_credentials",
+        description="Load saved sync credentials from system keychain",
+        input_schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        },
+        handler=load_sync_credentials_tool,
+    ),
+    ToolDefinition(
+        name="delete_sync_credentials",
+        description="Delete saved sync credentials from system keychain",
+        input_schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        },
+        handler=delete_sync_credentials_tool,
+    ),
+    ToolDefinition(
+        name="sync_collection",
+        description="Synchronize Anki collection with AnkiWeb or a self-hosted sync server. Uploads local changes and downloads remote changes. By default syncs both collection data and media files.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "username": {
+                    "type": "string",
+                    "description": "AnkiWeb ID or sync server username (optional if saved)"
+                },
+                "password": {
+                    "type": "string",
+                    "description": "Account password (optional if saved)"
+                },
+                "endpoint": {
+                    "type": "string",
+                    "description": "Sync server URL (optional). Leave empty for AnkiWeb. Example: https://sync.example.com"
+                },
+                "sync_media": {
+                    "type": "boolean",
+                    "description": "Include media files (images, audio) in sync (default: true)",
+                    "default": True
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=sync_collection_tool,
+    ),
+    ToolDefinition(
+        name="start_sync",
+        description="Start syncing the collection with AnkiWeb or a self-hosted sync server in the background and return a job ID. Poll sync_status for progress and the result. Other tools stay available while it runs.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "username": {
+                    "type": "string",
+                    "description": "AnkiWeb ID or sync server username (optional if saved)"
+                },
+                "password": {
+                    "type": "string",
+                    "description": "Account password (optional if saved)"
+                },
+                "endpoint": {
+                    "type": "string",
+                    "description": "Sync server URL (optional). Leave empty for AnkiWeb. Example: https://sync.example.com"
+                },
+                "sync_media": {
+                    "type": "boolean",
+                    "description": "Include media files (images, audio) in sync (default: true)",
+                    "default": True
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=start_sync_tool,
+    ),
+    ToolDefinition(
+        name="sync_status",
+        description="Get the phase, progress (sync stage, bytes, media files) and result of a background sync started with start_sync. Without job_id, lists recent sync jobs.",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID returned by start_sync (optional)"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=sync_status_tool,
+    ),
+    ToolDefinition(
+        name="job_status",
+        description="Report the progress or result of background jobs started by bulk tools or start_sync",
+        input_schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job ID to report (optional, lists recent jobs if omitted)"
+                },
+                "kind": {
+                    "type": "string",
+                    "description": "Only list jobs of this kind, e.g. 'move_cards' or 'sync' (optional)"
+                },
+                "collection_path": COLLECTION_PATH
+            },
+            "required": []
+        },
+        handler=job_status_tool,
+    ),
+
+]
+
+TOOLS_BY_NAME: dict[str, ToolDefinition] = {tool.name: tool for tool in TOOLS}
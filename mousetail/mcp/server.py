@@ -5,32 +5,53 @@ that exposes Anki functionality to LLMs like Claude. It handles tool registratio
 request routing, and response formatting.
 """
 
+import asyncio
+import json
 import logging
+import time
+import weakref
 from typing import Any
 from mcp.server import Server
-from mcp.types import Tool, TextContent
+from mcp.types import InitializedNotification, Tool, TextContent
+
+try:
+    import orjson
+except ImportError:  # optional fast encoder
+    orjson = None
 
 from mousetail.server.collection_manager import get_manager
-from mousetail.mcp.tools import (
-    list_collections_tool,
-    list_decks_tool,
-    list_note_types_tool,
-    create_note_tool,
-    search_notes_tool,
-    get_note_tool,
-    update_note_tool,
-    create_deck_tool,
-    get_collection_info_tool,
-    save_sync_credentials_tool,
-    load_sync_credentials_tool,
-    delete_sync_credentials_tool,
-    sync_collection_tool,
-)
+from mousetail.mcp.registry import TOOLS, TOOLS_BY_NAME
+from mousetail.mcp.sync_scheduler import SyncScheduler
+from mousetail.mcp.config import load_config
 
 
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj: Any) -> Any:
+    """Convert values the JSON encoders don't handle natively."""
+    if hasattr(obj, '__iter__') and not isinstance(obj, (str, bytes)):
+        return list(obj)
+    return str(obj)
+
+
+def encode_result(result: Any) -> str:
+    """Encode a tool result as compact JSON.
+
+    Uses orjson when it is installed, falling back to the standard library
+    encoder. Either way the result is serialized exactly once.
+
+    Args:
+        result: Tool result (normally a dict).
+
+    Returns:
+        Compact JSON text.
+    """
+    if orjson is not None:
+        return orjson.dumps(result, default=_json_default).decode('utf-8')
+    return json.dumps(result, default=_json_default, ensure_ascii=False, separators=(',', ':'))
+
+
 class AnkiMCPServer:
     """MCP Server for Anki operations.
 
@@ -42,6 +63,11 @@ class AnkiMCPServer:
     Attributes:
         server: The underlying MCP Server instance.
         manager: CollectionManager instance for database operations.
+        tools: Tool objects built once from the registry.
+        max_concurrent_requests: Tool calls a single client session may have
+            in flight at once.
+        sync_scheduler: SyncScheduler syncing edited collections
+            automatically, or None unless enabled in config.json.
 
     Example:
         >>> server = AnkiMCPServer()
@@ -51,21 +77,75 @@ class AnkiMCPServer:
     def __init__(self):
         """Initialize the Anki MCP server.
 
-        Creates a new MCP server instance named "anki-mcp" and sets up
-        all tool handlers for Anki operations.
+        Creates a new MCP server instance named "anki-mcp", builds the tool
+        list from the registry once, and sets up all tool handlers for Anki
+        operations.
         """
         self.server = Server("anki-mcp")
         self.manager = get_manager()
+
+        config = load_config()
+        self.structured_content = config.get("responses", {}).get("structured_content", True)
+        self.prewarm = config.get("collection", {}).get("prewarm", False)
+        self.default_path = config.get("collection", {}).get("default_path")
+        self.manager.read_workers = config.get("collection", {}).get("read_workers", self.manager.read_workers)
+        self.manager.max_open = config.get("collection", {}).get("max_open", self.manager.max_open)
+        self.manager.idle_close = config.get("collection", {}).get("idle_close", self.manager.idle_close)
+        self.max_concurrent_requests = config.get("server", {}).get("max_concurrent_requests", 4)
+        self._client_limits = weakref.WeakKeyDictionary()
+
+        auto_sync = config.get("sync", {}).get("auto", {})
+        self.sync_scheduler = None
+        if auto_sync.get("enabled"):
+            self.sync_scheduler = SyncScheduler(
+                self.manager,
+                quiet_period=auto_sync.get("quiet_period", 60),
+                max_backoff=auto_sync.get("max_backoff", 3600),
+                sync_media=auto_sync.get("sync_media", False),
+            )
+            self.sync_scheduler.start()
+        self.tools = [
+            Tool(name=tool.name, description=tool.description, inputSchema=tool.input_schema)
+            for tool in TOOLS
+        ]
         self._setup_handlers()
 
+    def _client_limit(self, session) -> asyncio.Semaphore:
+        """Get the concurrency limit for a client session.
+
+        Each connected client gets its own semaphore, so one busy client
+        can't starve the others when several share this server. Entries go
+        away with their session.
+
+        Args:
+            session: The ServerSession the request arrived on.
+
+        Returns:
+            Semaphore bounding that session's in-flight tool calls.
+        """
+        limit = self._client_limits.get(session)
+        if limit is None:
+            limit = asyncio.Semaphore(self.max_concurrent_requests)
+            self._client_limits[session] = limit
+        return limit
+
     def _setup_handlers(self):
         """Setup MCP server handlers.
 
         Registers the list_tools and call_tool handlers with the MCP server.
-        These handlers define the available operations and route requests
-        to the appropriate tool implementations.
+        Both are driven by the tool registry in mousetail.mcp.registry.
+        Also starts the optional collection prewarm once the client has
+        finished initialization.
         """
 
+        async def on_initialized(notification: InitializedNotification):
+            """Open the default collection in the background if configured."""
+            if self.prewarm:
+                logger.info("Prewarming default collection")
+                self.manager.prewarm(self.default_path)
+
+        self.server.notification_handlers[InitializedNotification] = on_initialized
+
         @self.server.list_tools()
         async def list_tools() -> list[Tool]:
             """List available tools.
@@ -73,344 +153,55 @@ class AnkiMCPServer:
             Returns:
                 List of Tool objects describing available Anki operations.
             """
-            return [
-                Tool(
-                    name="list_collections",
-                    description="List all available Anki collections on the system",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="get_collection_info",
-                    description="Get information about an Anki collection (name, card count, note count)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional, uses default if not provided)"
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="list_decks",
-                    description="List all decks in the collection with their names and IDs",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional)"
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="create_deck",
-                    description="Create a new deck in the collection",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "deck_name": {
-                                "type": "string",
-                                "description": "Name of the deck to create"
-                            },
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional)"
-                            }
-                        },
-                        "required": ["deck_name"]
-                    }
-                ),
-                Tool(
-                    name="list_note_types",
-                    description="List all note types (card templates) available in the collection",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional)"
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="create_note",
-                    description="Create a new note (flashcard) in Anki. A note generates one or more cards based on the note type template.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "deck_name": {
-                                "type": "string",
-                                "description": "Name of the deck where the note should be added"
-                            },
-                            "note_type_name": {
-                                "type": "string",
-                                "description": "Name of the note type (e.g., 'Basic', 'Cloze')"
-                            },
-                            "fields": {
-                                "type": "object",
-                                "description": "Field name to value mapping (e.g., {'Front': 'Question', 'Back': 'Answer'})",
-                                "additionalProperties": {"type": "string"}
-                            },
-                            "tags": {
-                                "type": "array",
-                                "description": "Optional list of tags",
-                                "items": {"type": "string"},
-                                "default": []
-                            },
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional)"
-                            }
-                        },
-                        "required": ["deck_name", "note_type_name", "fields"]
-                    }
-                ),
-                Tool(
-                    name="search_notes",
-                    description="Search for notes using Anki search syntax. Examples: 'deck:MyDeck', 'tag:important', 'front:*python*'",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Anki search query"
-                            },
-                            "limit": {
-                                "type": "integer",
-                                "description": "Maximum number of results (optional)",
-                                "default": 100
-                            },
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional)"
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                ),
-                Tool(
-                    name="get_note",
-                    description="Get detailed information about a specific note by ID",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "note_id": {
-                                "type": "integer",
-                                "description": "ID of the note to retrieve"
-                            },
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional)"
-                            }
-                        },
-                        "required": ["note_id"]
-                    }
-                ),
-                Tool(
-                    name="update_note",
-                    description="Update an existing note's fields and/or tags",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "note_id": {
-                                "type": "integer",
-                                "description": "ID of the note to update"
-                            },
-                            "fields": {
-                                "type": "object",
-                                "description": "Field name to value mapping for fields to update",
-                                "additionalProperties": {"type": "string"}
-                            },
-                            "tags": {
-                                "type": "array",
-                                "description": "New list of tags (replaces existing tags)",
-                                "items": {"type": "string"}
-                            },
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional)"
-                            }
-                        },
-                        "required": ["note_id"]
-                    }
-                ),
-                Tool(
-                    name="save_sync_credentials",
-                    description="Save sync credentials securely to system keychain (macOS Keychain, Windows Credential Manager, or Linux Secret Service)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "username": {
-                                "type": "string",
-                                "description": "AnkiWeb ID or sync server username"
-                            },
-                            "password": {
-                                "type": "string",
-                                "description": "Account password"
-                            },
-                            "endpoint": {
-                                "type": "string",
-                                "description": "Sync server URL (optional). Leave empty for AnkiWeb. Example: https://sync.example.com"
-                            }
-                        },
-                        "required": ["username", "password"]
-                    }
-                ),
-                Tool(
-                    name="load_sync_credentials",
-                    description="Load saved sync credentials from system keychain",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="delete_sync_credentials",
-                    description="Delete saved sync credentials from system keychain",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="sync_collection",
-                    description="Synchronize Anki collection with AnkiWeb or a self-hosted sync server. Uploads local changes and downloads remote changes. By default syncs both collection data and media files.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "username": {
-                                "type": "string",
-                                "description": "AnkiWeb ID or sync server username (optional if saved)"
-                            },
-                            "password": {
-                                "type": "string",
-                                "description": "Account password (optional if saved)"
-                            },
-                            "endpoint": {
-                                "type": "string",
-                                "description": "Sync server URL (optional). Leave empty for AnkiWeb. Example: https://sync.example.com"
-                            },
-                            "sync_media": {
-                                "type": "boolean",
-                                "description": "Include media files (images, audio) in sync (default: true)",
-                                "default": True
-                            },
-                            "collection_path": {
-                                "type": "string",
-                                "description": "Path to collection file (optional)"
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-            ]
-
-        @self.server.call_tool()
-        async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+            return self.tools
+
+        # Arguments are validated here with the registry's precompiled validators
+        @self.server.call_tool(validate_input=False)
+        async def call_tool(name: str, arguments: dict[str, Any]):
             """Handle tool calls.
 
-            Routes incoming tool requests to the appropriate implementation
-            and returns formatted results.
+            Looks the tool up in the registry, validates the arguments against
+            its schema and awaits its handler, holding one of the calling
+            client's concurrency slots while it runs.
 
             Args:
                 name: Name of the tool to execute.
                 arguments: Dictionary of arguments for the tool.
 
             Returns:
-                List containing a TextContent object with the result.
+                List containing a TextContent object with the result as compact
+                JSON, paired with the result dict as structured content unless
+                disabled in config.json.
             """
+            logger.info(f"Tool called: {name}")
+            logger.debug(f"Tool {name} args: {arguments}")
+            started = time.perf_counter()
+
+            tool = TOOLS_BY_NAME.get(name)
+            limit = self._client_limit(self.server.request_context.session)
             try:
-                logger.info(f"Tool called: {name} with args: {arguments}")
-
-                if name == "list_collections":
-                    result = await list_collections_tool()
-                elif name == "get_collection_info":
-                    result = await get_collection_info_tool(
-                        arguments.get("collection_path")
-                    )
-                elif name == "list_decks":
-                    result = await list_decks_tool(
-                        arguments.get("collection_path")
-                    )
-                elif name == "create_deck":
-                    result = await create_deck_tool(
-                        arguments["deck_name"],
-                        arguments.get("collection_path")
-                    )
-                elif name == "list_note_types":
-                    result = await list_note_types_tool(
-                        arguments.get("collection_path")
-                    )
-                elif name == "create_note":
-                    result = await create_note_tool(
-                        arguments["deck_name"],
-                        arguments["note_type_name"],
-                        arguments["fields"],
-                        arguments.get("tags", []),
-                        arguments.get("collection_path")
-                    )
-                elif name == "search_notes":
-                    result = await search_notes_tool(
-                        arguments["query"],
-                        arguments.get("limit", 100),
-                        arguments.get("collection_path")
-                    )
-                elif name == "get_note":
-                    result = await get_note_tool(
-                        arguments["note_id"],
-                        arguments.get("collection_path")
-                    )
-                elif name == "update_note":
-                    result = await update_note_tool(
-                        arguments["note_id"],
-                        arguments.get("fields"),
-                        arguments.get("tags"),
-                        arguments.get("collection_path")
-                    )
-                elif name == "save_sync_credentials":
-                    result = await save_sync_credentials_tool(
-                        arguments["username"],
-                        arguments["password"],
-                        arguments.get("endpoint")
-                    )
-                elif name == "load_sync_credentials":
-                    result = await load_sync_credentials_tool()
-                elif name == "delete_sync_credentials":
-                    result = await delete_sync_credentials_tool()
-                elif name == "sync_collection":
-                    result = await sync_collection_tool(
-                        arguments.get("username"),
-                        arguments.get("password"),
-                        arguments.get("endpoint"),
-                        arguments.get("sync_media", True),
-                        arguments.get("collection_path")
-                    )
+                if tool is None:
+                    result = {"success": False, "error": f"Unknown tool: {name}"}
+                elif (error := tool.validate(arguments)) is not None:
+                    result = {"success": False, "error": error}
                 else:
-                    result = {"error": f"Unknown tool: {name}"}
-
-                return [TextContent(
-                    type="text",
-                    text=str(result)
-                )]
+                    async with limit:
+                        result = await tool.call(arguments)
             except Exception as e:
                 logger.error(f"Error executing tool {name}: {e}", exc_info=True)
-                return [TextContent(
-                    type="text",
-                    text=f"Error: {str(e)}"
-                )]
+                result = {"success": False, "error": str(e)}
+
+            if 'first_call_ms' not in self.manager.timings:
+                self.manager.timings['first_call_ms'] = round((time.perf_counter() - started) * 1000, 1)
+                logger.info(f"First tool call ({name}) took {self.manager.timings['first_call_ms']} ms")
+
+            content = [TextContent(
+                type="text",
+                text=encode_result(result)
+            )]
+            if self.structured_content:
+                return content, result
+            return content
 
     def get_server(self) -> Server:
         """Get the MCP server instance.
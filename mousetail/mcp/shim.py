@@ -0,0 +1,158 @@
+"""Lightweight stdio entry point that relays to the mousetail daemon.
+
+MCP clients launch their server over stdio and kill it when the session ends,
+so a plain stdio server pays for importing Anki and opening the collection
+every time. This shim instead forwards stdin and stdout to a long-lived daemon
+(see mousetail.mcp.daemon) over a Unix domain socket, starting the daemon
+first if it isn't already running.
+
+Only the standard library is imported here, so the shim itself starts in
+milliseconds.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+SOCKET_ENV = "MOUSETAIL_SOCKET"
+START_TIMEOUT = 30.0
+CHUNK_SIZE = 65536
+
+
+def default_socket_path() -> Path:
+    """Get the daemon's socket path.
+
+    Uses ``$MOUSETAIL_SOCKET`` when set, otherwise a per-user location under
+    ``$XDG_RUNTIME_DIR`` or the system temp directory.
+
+    Returns:
+        Path of the daemon's Unix domain socket.
+    """
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV]).expanduser()
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "mousetail" / "daemon.sock"
+    return Path(tempfile.gettempdir()) / f"mousetail-{os.getuid()}" / "daemon.sock"
+
+
+def connect(socket_path: Path) -> Optional[socket.socket]:
+    """Connect to the daemon.
+
+    Args:
+        socket_path: Path of the daemon's socket.
+
+    Returns:
+        Connected socket, or None if no daemon is listening.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def start_daemon(socket_path: Path):
+    """Start the daemon in the background, detached from this process.
+
+    The daemon's output goes to ``daemon.log`` next to its socket.
+
+    Args:
+        socket_path: Path the daemon should listen on.
+    """
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    log_file = open(socket_path.parent / "daemon.log", "ab")
+    subprocess.Popen(
+        [sys.executable, "-m", "mousetail.mcp.stdio_server", "serve", "--daemon",
+         "--socket", str(socket_path)],
+        stdin=subprocess.DEVNULL,
+        stdout=log_file,
+        stderr=log_file,
+        start_new_session=True,
+    )
+    log_file.close()
+
+
+def connect_or_start(socket_path: Path, timeout: float = START_TIMEOUT) -> socket.socket:
+    """Connect to the daemon, starting it first if necessary.
+
+    Args:
+        socket_path: Path of the daemon's socket.
+        timeout: Seconds to wait for a freshly started daemon to listen.
+
+    Returns:
+        Connected socket.
+
+    Raises:
+        RuntimeError: If the daemon doesn't start listening in time.
+    """
+    sock = connect(socket_path)
+    if sock is not None:
+        return sock
+
+    start_daemon(socket_path)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        sock = connect(socket_path)
+        if sock is not None:
+            return sock
+    raise RuntimeError(
+        f"mousetail daemon did not start listening on {socket_path} "
+        f"(see {socket_path.parent / 'daemon.log'})"
+    )
+
+
+def relay(sock: socket.socket):
+    """Copy stdin to the socket and the socket to stdout until either closes.
+
+    Args:
+        sock: Connected daemon socket.
+    """
+    stdin = sys.stdin.buffer.fileno()
+    stdout = sys.stdout.buffer.fileno()
+
+    def forward_stdin():
+        try:
+            while data := os.read(stdin, CHUNK_SIZE):
+                sock.sendall(data)
+        except OSError:
+            pass
+        finally:
+            try:
+                sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    threading.Thread(target=forward_stdin, daemon=True).start()
+
+    try:
+        while data := sock.recv(CHUNK_SIZE):
+            while data:
+                data = data[os.write(stdout, data):]
+    except OSError:
+        pass
+    finally:
+        sock.close()
+
+
+def main():
+    """Entry point for the mousetail-shim script."""
+    try:
+        sock = connect_or_start(default_socket_path())
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    relay(sock)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 """MCP server with stdio transport for Claude Desktop integration."""
 
+import argparse
 import asyncio
 import logging
+import time
+
+_import_started = time.perf_counter()
+
 from mcp.server.stdio import stdio_server
 
 from mousetail.mcp.server import AnkiMCPServer
 
+_import_ms = round((time.perf_counter() - _import_started) * 1000, 1)
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,6 +25,9 @@ async def async_main():
     anki_server = AnkiMCPServer()
     server = anki_server.get_server()
 
+    anki_server.manager.timings['server_import_ms'] = _import_ms
+    logger.info(f"Server modules imported in {_import_ms} ms")
+
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -26,9 +36,35 @@ async def async_main():
         )
 
 
-def main():
-    """Entry point for the mousetail script."""
-    asyncio.run(async_main())
+def main(argv=None):
+    """Entry point for the mousetail script.
+
+    With no arguments the server speaks MCP over stdio, which is what MCP
+    clients expect when they launch it. ``mousetail serve --http`` and
+    ``mousetail serve --daemon`` instead run one long-lived server that many
+    clients can connect to, over HTTP or a Unix domain socket (relayed by
+    mousetail-shim) respectively.
+    """
+    parser = argparse.ArgumentParser(prog="mousetail", description="MCP server for Anki")
+    parser.add_argument("command", nargs="?", choices=["serve"], help="run the server (the default)")
+    parser.add_argument("--http", action="store_true", help="serve Streamable HTTP instead of stdio")
+    parser.add_argument("--daemon", action="store_true", help="serve on a Unix domain socket for mousetail-shim")
+    parser.add_argument("--socket", default=None, help="socket path with --daemon")
+    parser.add_argument("--host", default=None, help="interface to listen on with --http (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=None, help="port to listen on with --http (default 8000)")
+    args = parser.parse_args(argv)
+
+    if args.http:
+        from mousetail.mcp import http_server
+        http_server.run(
+            host=args.host or http_server.DEFAULT_HOST,
+            port=args.port or http_server.DEFAULT_PORT,
+        )
+    elif args.daemon:
+        from mousetail.mcp import daemon
+        daemon.run(args.socket)
+    else:
+        asyncio.run(async_main())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+"""Automatic background sync after edits.
+
+The scheduler listens for writes reported by the CollectionManager. Once a
+modified collection has seen no further writes for a quiet period, it starts
+an ordinary background sync job (the same one start_sync uses) with the saved
+credentials. Failed syncs are retried with exponential backoff, and because
+jobs are one per collection, a collection never has two syncs running.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from mousetail.server.collection_manager import JOB_FAILED, JOB_RUNNING, CollectionManager
+from mousetail.mcp.tools import _resolve_sync_credentials, _start_sync_job
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUIET_PERIOD = 60.0
+DEFAULT_MAX_BACKOFF = 3600.0
+
+
+class SyncScheduler:
+    """Sync collections in the background a while after they were edited.
+
+    Attributes:
+        manager: CollectionManager whose writes trigger syncs.
+        quiet_period: Seconds without writes before a collection is synced.
+        max_backoff: Longest wait in seconds before retrying a failing sync.
+        sync_media: Include media files in automatic syncs.
+
+    Example:
+        >>> scheduler = SyncScheduler(get_manager(), quiet_period=30)
+        >>> scheduler.start()
+    """
+
+    def __init__(
+        self,
+        manager: CollectionManager,
+        quiet_period: float = DEFAULT_QUIET_PERIOD,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        sync_media: bool = False
+    ):
+        self.manager = manager
+        self.quiet_period = quiet_period
+        self.max_backoff = max_backoff
+        self.sync_media = sync_media
+
+        self._cond = threading.Condition()
+        self._dirty: dict[str, float] = {}
+        self._jobs: dict[str, str] = {}
+        self._failures: dict[str, int] = {}
+        self._retry_at: dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self):
+        """Start watching writes and syncing."""
+        self.manager.add_write_listener(self.notify)
+        self._thread = threading.Thread(target=self._loop, name="mousetail-autosync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop scheduling syncs (running syncs are left to finish)."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def notify(self, path: str):
+        """Record a write to a collection, restarting its quiet period."""
+        with self._cond:
+            self._dirty[path] = time.monotonic()
+            self._cond.notify()
+
+    def status(self) -> dict:
+        """Get the scheduler's view of each collection it is tracking.
+
+        Returns:
+            Dict mapping collection path to 'pending' (edited, not yet
+            synced), 'job' (id of its running sync, if any) and 'failures'
+            (consecutive failed syncs)
+        """
+        with self._cond:
+            paths = set(self._dirty) | set(self._jobs) | set(self._failures)
+            return {
+                path: {
+                    'pending': path in self._dirty,
+                    'job': self._jobs.get(path),
+                    'failures': self._failures.get(path, 0),
+                }
+                for path in paths
+            }
+
+    def _loop(self):
+        """Wait for collections to become due, then sync them."""
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                self._check_jobs()
+                now = time.monotonic()
+                due = [path for path in self._dirty if self._due_at(path) <= now]
+                if not due:
+                    wake = min((self._due_at(path) for path in self._dirty), default=None)
+                    if self._jobs:
+                        # Poll running syncs for their outcome
+                        wake = min(wake or now + 1.0, now + 1.0)
+                    self._cond.wait(None if wake is None else max(wake - now, 0.05))
+                    continue
+                for path in due:
+                    del self._dirty[path]
+
+            for path in due:
+                self._start(path)
+
+    def _due_at(self, path: str) -> float:
+        """When a dirty collection may next be synced (call with the lock held)."""
+        if path in self._jobs:
+            return float('inf')
+        return max(self._dirty[path] + self.quiet_period, self._retry_at.get(path, 0.0))
+
+    def _start(self, path: str):
+        """Start a sync job for a collection."""
+        credentials, error = _resolve_sync_credentials(None, None, None)
+        if error is not None:
+            self._finished(path, error.get("error"))
+            return
+
+        try:
+            job = _start_sync_job(credentials, self.sync_media, path)
+        except Exception as e:
+            self._finished(path, str(e))
+            return
+
+        logger.info(f"Auto-sync of {path} started (job {job['id']})")
+        with self._cond:
+            self._jobs[path] = job['id']
+
+    def _check_jobs(self):
+        """Record the outcome of finished sync jobs (call with the lock held)."""
+        for path, job_id in list(self._jobs.items()):
+            job = self.manager.get_job(job_id)
+            if job is not None and job['status'] == JOB_RUNNING:
+                continue
+            del self._jobs[path]
+
+            if job is None:
+                error = "job was forgotten"
+            elif job['status'] == JOB_FAILED:
+                error = job['error']
+            elif not job['result'].get("success"):
+                error = job['result'].get("error")
+            elif job['result'].get("full_sync_required"):
+                error = "a full sync is required; sync from Anki to resolve it"
+            else:
+                error = None
+            self._finished(path, error)
+
+    def _finished(self, path: str, error: Optional[str]):
+        """Reset or back off a collection's retries after a sync attempt."""
+        with self._cond:
+            if error is None:
+                self._failures.pop(path, None)
+                self._retry_at.pop(path, None)
+                logger.info(f"Auto-sync of {path} finished")
+                return
+
+            failures = self._failures.get(path, 0) + 1
+            self._failures[path] = failures
+            delay = min(self.quiet_period * 2 ** failures, self.max_backoff)
+            self._retry_at[path] = time.monotonic() + delay
+            # Still unsynced: try again once the backoff has passed
+            self._dirty.setdefault(path, time.monotonic())
+            logger.warning(f"Auto-sync of {path} failed ({error}); retrying in {round(delay)} s")
@@ -5,21 +5,29 @@ by the Anki MCP server. Each function corresponds to a tool that LLMs
 can call to interact with Anki collections.
 """
 
+import asyncio
+import base64
 import json
-import keyring
+import re
+import time
 from pathlib import Path
 from typing import Optional
-from mousetail.server.collection_manager import get_manager
+from mousetail.mcp.config import load_config
+from mousetail.server.collection_manager import duplicate_key, get_manager
+
+# anki and keyring are imported inside the tools that need them, so the
+# server can answer the MCP handshake before those heavy modules load.
 
 
 async def list_collections_tool() -> dict:
     """List all available Anki collections.
 
-    Scans the system for Anki profile directories and returns information
-    about all discovered collections.
+    Returns information about all discovered collections from the manager's
+    discovery index, without opening any of them.
 
     Returns:
-        Dict with 'collections' (list of collection info) and 'count' (int).
+        Dict with 'collections' (list of dicts with profile, path, size, modified,
+        last known note/card counts and state) and 'count' (int).
     """
     manager = get_manager()
 
@@ -35,6 +43,9 @@ async def list_collections_tool() -> dict:
                 "error": str(e)
             }
 
+    for collection in collections:
+        collection['state'] = manager.collection_state(collection['path'])
+
     return {
         "collections": collections,
         "count": len(collections)
@@ -51,14 +62,41 @@ async def get_collection_info_tool(collection_path: Optional[str] = None) -> dic
         Dict with 'success' (bool), 'collection' (info dict) or 'error' (str).
     """
     manager = get_manager()
-    try:
+
+    def work(path):
         # Check accessibility first
-        manager.check_collection_accessible(collection_path)
-        info = manager.get_collection_info(collection_path)
+        manager.check_collection_accessible(path)
+        info = manager.get_collection_info(path)
         return {
             "success": True,
             "collection": info
         }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def get_collection_stats_tool() -> dict:
+    """Get memory and handle statistics for the open collections.
+
+    Also reports the pool limits: how many collections may stay open and how
+    long an unused one stays open before it is closed.
+
+    Returns:
+        Dict with 'success' (bool) and 'stats' (dict with 'process', 'limits'
+        and per-collection 'collections' entries) or 'error' (str).
+    """
+    manager = get_manager()
+    try:
+        return {
+            "success": True,
+            "stats": manager.collection_stats()
+        }
     except Exception as e:
         return {
             "success": False,
@@ -76,15 +114,16 @@ async def list_decks_tool(collection_path: Optional[str] = None) -> dict:
         Dict with 'success' (bool), 'decks' (list), 'count' (int) or 'error' (str).
     """
     manager = get_manager()
-    try:
+
+    def work(path):
         # Check accessibility first
-        manager.check_collection_accessible(collection_path)
-        with manager.get_collection(collection_path) as col:
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
             decks = []
-            for deck_name_id in col.decks.all_names_and_ids():
+            for deck_id, deck_name in manager.get_metadata(col)['decks']:
                 decks.append({
-                    "id": deck_name_id.id,
-                    "name": deck_name_id.name
+                    "id": deck_id,
+                    "name": deck_name
                 })
 
             return {
@@ -92,6 +131,9 @@ async def list_decks_tool(collection_path: Optional[str] = None) -> dict:
                 "decks": decks,
                 "count": len(decks)
             }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
     except Exception as e:
         return {
             "success": False,
@@ -110,16 +152,20 @@ async def create_deck_tool(deck_name: str, collection_path: Optional[str] = None
         Dict with 'success' (bool), 'message' (str), 'deck_id' (int) or 'error' (str).
     """
     manager = get_manager()
-    try:
+
+    def work(path):
         # Check accessibility first
-        manager.check_collection_accessible(collection_path)
-        with manager.get_collection(collection_path) as col:
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path) as col:
             deck_id = col.decks.add_normal_deck_with_name(deck_name).id
             return {
                 "success": True,
                 "message": f"Deck '{deck_name}' created successfully",
                 "deck_id": deck_id
             }
+
+    try:
+        return await manager.run(work, collection_path)
     except Exception as e:
         return {
             "success": False,
@@ -137,20 +183,18 @@ async def list_note_types_tool(collection_path: Optional[str] = None) -> dict:
         Dict with 'success' (bool), 'note_types' (list with id, name, fields), 'count' (int) or 'error' (str).
     """
     manager = get_manager()
-    try:
+
+    def work(path):
         # Check accessibility first
-        manager.check_collection_accessible(collection_path)
-        with manager.get_collection(collection_path) as col:
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
+            metadata = manager.get_metadata(col)
             note_types = []
-            for notetype_name_id in col.models.all_names_and_ids():
-                # Get full note type to include field information
-                notetype = col.models.get(notetype_name_id.id)
-                fields = [field['name'] for field in notetype['flds']]
-
+            for notetype_id, notetype in metadata['notetypes'].items():
                 note_types.append({
-                    "id": notetype_name_id.id,
-                    "name": notetype_name_id.name,
-                    "fields": fields
+                    "id": notetype_id,
+                    "name": notetype['name'],
+                    "fields": metadata['field_names'][notetype_id]
                 })
 
             return {
@@ -158,6 +202,9 @@ async def list_note_types_tool(collection_path: Optional[str] = None) -> dict:
                 "note_types": note_types,
                 "count": len(note_types)
             }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
     except Exception as e:
         return {
             "success": False,
@@ -165,49 +212,77 @@ async def list_note_types_tool(collection_path: Optional[str] = None) -> dict:
         }
 
 
+DUPLICATE_MODES = ("allow", "skip", "upsert")
+
+
+def _upsert_note(col, nid: int, fields: dict, tags: list[str]):
+    """Update an existing note with the given fields and add the given tags."""
+    note = col.get_note(nid)
+    for field_name, value in fields.items():
+        note[field_name] = value
+    for tag in tags:
+        note.add_tag(tag)
+    return note
+
+
 async def create_note_tool(
     deck_name: str,
     note_type_name: str,
     fields: dict[str, str],
     tags: list[str] = None,
+    on_duplicate: str = "allow",
     collection_path: Optional[str] = None
 ) -> dict:
     """Create a new note (flashcard).
 
+    A note duplicates another if it has the same note type and the same
+    first field, ignoring HTML, case and extra whitespace. Duplicates are
+    looked up in the collection's duplicate index rather than by searching.
+
     Args:
         deck_name: Name of the deck where the note will be added.
         note_type_name: Name of the note type (e.g., 'Basic', 'Cloze').
         fields: Dictionary mapping field names to values (e.g., {'Front': 'Question', 'Back': 'Answer'}).
         tags: Optional list of tags to add to the note.
+        on_duplicate: What to do if the note duplicates an existing one:
+                      'allow' adds it anyway, 'skip' leaves the existing note
+                      alone, 'upsert' updates the existing note's given
+                      fields and adds the tags (its deck is unchanged).
         collection_path: Path to the collection file. If None, uses the default collection.
 
     Returns:
-        Dict with 'success' (bool), 'message' (str), 'note_id' (int), 'card_count' (int) or 'error' (str).
+        Dict with 'success' (bool), 'message' (str), 'note_id' (int), 'card_count' (int)
+        and, for a duplicate, 'skipped' or 'updated' (True); or 'error' (str).
     """
     manager = get_manager()
     if tags is None:
         tags = []
+    if on_duplicate not in DUPLICATE_MODES:
+        return {
+            "success": False,
+            "error": f"Unknown on_duplicate '{on_duplicate}', expected one of: {', '.join(DUPLICATE_MODES)}"
+        }
 
-    try:
+    def work(path):
         # Check accessibility first
-        manager.check_collection_accessible(collection_path)
-        with manager.get_collection(collection_path) as col:
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path) as col:
             # Get note type
-            notetype = col.models.by_name(note_type_name)
+            notetype = manager.find_notetype(col, note_type_name)
             if not notetype:
                 return {
                     "success": False,
                     "error": f"Note type '{note_type_name}' not found",
-                    "available_note_types": [nt.name for nt in col.models.all_names_and_ids()]
+                    "available_note_types": [nt['name'] for nt in manager.get_metadata(col)['notetypes'].values()]
                 }
 
             # Get deck
-            deck_id = col.decks.id_for_name(deck_name)
+            deck_id = manager.find_deck_id(col, deck_name)
             if not deck_id:
                 return {
                     "success": False,
                     "error": f"Deck '{deck_name}' not found",
-                    "available_decks": [d.name for d in col.decks.all_names_and_ids()]
+                    "available_decks": [name for _, name in manager.get_metadata(col)['decks']]
                 }
 
             # Create note
@@ -229,8 +304,34 @@ async def create_note_tool(
             for tag in tags:
                 note.add_tag(tag)
 
+            mod = col.mod
+            duplicates = []
+            if on_duplicate != "allow":
+                duplicates = manager.find_duplicate_notes(col, notetype['id'], note.fields[0])
+
+            if duplicates and on_duplicate == "skip":
+                return {
+                    "success": True,
+                    "skipped": True,
+                    "message": f"Note duplicates existing note {duplicates[0]}, not added",
+                    "note_id": duplicates[0],
+                    "card_count": len(col.card_ids_of_note(duplicates[0]))
+                }
+            if duplicates:
+                note = _upsert_note(col, duplicates[0], fields, tags)
+                col.update_note(note)
+                manager.update_duplicate_index(col, [note.id], mod)
+                return {
+                    "success": True,
+                    "updated": True,
+                    "message": f"Updated existing note {note.id}",
+                    "note_id": note.id,
+                    "card_count": len(note.card_ids())
+                }
+
             # Add to collection
             col.add_note(note, deck_id)
+            manager.update_duplicate_index(col, [note.id], mod)
 
             return {
                 "success": True,
@@ -238,6 +339,211 @@ async def create_note_tool(
                 "note_id": note.id,
                 "card_count": len(note.cards())
             }
+
+    try:
+        return await manager.run(work, collection_path)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+def _note_requests(col, specs: list[dict], notetypes: dict, deck_ids: dict) -> tuple:
+    """Build AddNoteRequests for note specs, as create_notes_tool accepts them.
+
+    Args:
+        col: Collection held for writing.
+        specs: Note specs with 'deck_name', 'note_type_name', 'fields' and optional 'tags'.
+        notetypes: Cache of note type name -> note type (or None), filled in as needed.
+        deck_ids: Cache of deck name -> deck ID (or None), filled in as needed.
+
+    Returns:
+        Tuple of (requests, index of each request's spec, {spec index: error})
+    """
+    from anki.collection import AddNoteRequest
+
+    manager = get_manager()
+    requests = []
+    request_indexes = []
+    errors = {}
+
+    for index, spec in enumerate(specs):
+        deck_name = spec.get("deck_name")
+        note_type_name = spec.get("note_type_name")
+        fields = spec.get("fields") or {}
+
+        # Resolve note type once per batch
+        if note_type_name not in notetypes:
+            notetypes[note_type_name] = manager.find_notetype(col, note_type_name) if note_type_name else None
+        notetype = notetypes[note_type_name]
+        if not notetype:
+            errors[index] = f"Note type '{note_type_name}' not found"
+            continue
+
+        # Resolve deck once per batch
+        if deck_name not in deck_ids:
+            deck_ids[deck_name] = manager.find_deck_id(col, deck_name) if deck_name else None
+        deck_id = deck_ids[deck_name]
+        if not deck_id:
+            errors[index] = f"Deck '{deck_name}' not found"
+            continue
+
+        note = col.new_note(notetype)
+
+        # Set fields
+        missing_field = None
+        for field_name, value in fields.items():
+            try:
+                note[field_name] = value
+            except KeyError:
+                missing_field = field_name
+                break
+        if missing_field is not None:
+            errors[index] = f"Field '{missing_field}' not found in note type '{note_type_name}'"
+            continue
+
+        # Set tags
+        for tag in spec.get("tags") or []:
+            note.add_tag(tag)
+
+        requests.append(AddNoteRequest(note=note, deck_id=deck_id))
+        request_indexes.append(index)
+
+    return requests, request_indexes, errors
+
+
+async def create_notes_tool(
+    notes: list[dict],
+    on_duplicate: str = "allow",
+    collection_path: Optional[str] = None
+) -> dict:
+    """Create many notes in a single transaction.
+
+    Note types and decks are resolved once per batch, and every valid note is
+    added through one ``col.add_notes`` call, so the whole batch is a single
+    undo step (notes updated by on_duplicate='upsert' included). Invalid specs are reported individually and do not prevent the
+    rest of the batch from being added.
+
+    Args:
+        notes: List of note specs, each a dict with 'deck_name', 'note_type_name',
+               'fields' and optional 'tags' (same meaning as in create_note).
+        on_duplicate: 'allow', 'skip' or 'upsert', as in create_note. With
+                      'skip' or 'upsert', a spec duplicating an earlier spec
+                      in the same batch is skipped.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'results' (list of per-note dicts with 'index',
+        'success' and 'note_id'/'card_count' or 'error', plus 'skipped' or
+        'updated' for duplicates), 'created', 'skipped', 'updated' and
+        'failed' (int) or 'error' (str).
+    """
+    if on_duplicate not in DUPLICATE_MODES:
+        return {
+            "success": False,
+            "error": f"Unknown on_duplicate '{on_duplicate}', expected one of: {', '.join(DUPLICATE_MODES)}"
+        }
+
+    manager = get_manager()
+
+    def work(path):
+        from anki.utils import ids2str
+
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path) as col:
+            mod = col.mod
+            requests, request_indexes, errors = _note_requests(col, notes, {}, {})
+            results = [
+                {"index": index, "success": False, "error": errors[index]} if index in errors else None
+                for index in range(len(notes))
+            ]
+
+            updates = {}
+            if on_duplicate != "allow":
+                new_requests = []
+                new_indexes = []
+                batch_keys = {}
+                for index, request in zip(request_indexes, requests):
+                    note = request.note
+                    key = duplicate_key(note.mid, note.fields[0])
+                    duplicates = manager.find_duplicate_notes(col, note.mid, note.fields[0])
+                    if key in batch_keys:
+                        results[index] = {
+                            "index": index,
+                            "success": True,
+                            "skipped": True,
+                            "duplicate_of_index": batch_keys[key]
+                        }
+                    elif duplicates and on_duplicate == "skip":
+                        results[index] = {
+                            "index": index,
+                            "success": True,
+                            "skipped": True,
+                            "note_id": duplicates[0]
+                        }
+                    elif duplicates:
+                        spec = notes[index]
+                        updates[index] = _upsert_note(col, duplicates[0], spec.get("fields") or {}, spec.get("tags") or [])
+                    else:
+                        new_requests.append(request)
+                        new_indexes.append(index)
+                    batch_keys.setdefault(key, index)
+                requests, request_indexes = new_requests, new_indexes
+
+            # Add all valid notes in one transaction
+            if requests and updates:
+                # Upserts are a second backend op; merge both into one undo
+                # step, and take the additions back if the updates fail
+                undo_entry = col.add_custom_undo_entry("Create Notes")
+                col.add_notes(requests)
+                try:
+                    col.update_notes(list(updates.values()))
+                except Exception:
+                    col.merge_undo_entries(undo_entry)
+                    col.undo()
+                    raise
+                col.merge_undo_entries(undo_entry)
+            elif requests:
+                col.add_notes(requests)
+            elif updates:
+                col.update_notes(list(updates.values()))
+
+            note_ids = [request.note.id for request in requests] + [note.id for note in updates.values()]
+            if note_ids:
+                manager.update_duplicate_index(col, note_ids, mod)
+                card_counts = dict(col.db.all(
+                    f"select nid, count() from cards where nid in {ids2str(note_ids)} group by nid"
+                ))
+                for index, request in zip(request_indexes, requests):
+                    results[index] = {
+                        "index": index,
+                        "success": True,
+                        "note_id": request.note.id,
+                        "card_count": card_counts.get(request.note.id, 0)
+                    }
+                for index, note in updates.items():
+                    results[index] = {
+                        "index": index,
+                        "success": True,
+                        "updated": True,
+                        "note_id": note.id,
+                        "card_count": card_counts.get(note.id, 0)
+                    }
+
+            skipped = sum(1 for result in results if result.get("skipped"))
+            return {
+                "success": True,
+                "results": results,
+                "created": len(requests),
+                "skipped": skipped,
+                "updated": len(updates),
+                "failed": len(errors)
+            }
+
+    try:
+        return await manager.run(work, collection_path)
     except Exception as e:
         return {
             "success": False,
@@ -245,38 +551,255 @@ async def create_note_tool(
         }
 
 
+def _encode_cursor(query: str, order: Optional[str], reverse: bool, offset: int) -> str:
+    """Encode a search position as an opaque cursor token."""
+    payload = json.dumps([query, order, reverse, offset], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, Optional[str], bool, int]:
+    """Decode a cursor token produced by _encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        query, order, reverse, offset = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return query, order, bool(reverse), int(offset)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
 async def search_notes_tool(
     query: str,
     limit: int = 100,
-    collection_path: Optional[str] = None
+    collection_path: Optional[str] = None,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    order: Optional[str] = None,
+    reverse: bool = False
 ) -> dict:
     """Search for notes using Anki search syntax.
 
+    The full list of matching IDs is cached while the collection is unchanged,
+    so requesting further pages of the same search does not re-run it.
+
     Args:
         query: Anki search query (e.g., 'deck:MyDeck', 'tag:important', 'front:*python*').
         limit: Maximum number of results to return. Default is 100.
         collection_path: Path to the collection file. If None, uses the default collection.
+        offset: Number of results to skip. Ignored when a cursor is given.
+        cursor: Cursor returned as 'next_cursor' by a previous call for the same search.
+        order: Browser column key to sort by (e.g., 'noteCrt', 'noteMod', 'noteFld',
+               'deck'). If None, results are unordered.
+        reverse: Reverse the sort order.
 
     Returns:
-        Dict with 'success' (bool), 'note_ids' (list), 'count' (int), 'query' (str) or 'error' (str).
+        Dict with 'success' (bool), 'note_ids' (list), 'count' (int), 'total' (int),
+        'offset' (int), 'next_cursor' (str or None), 'query' (str) or 'error' (str).
     """
+    if cursor:
+        try:
+            cursor_query, cursor_order, cursor_reverse, offset = _decode_cursor(cursor)
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        if (cursor_query, cursor_order, cursor_reverse) != (query, order, reverse):
+            return {
+                "success": False,
+                "error": "Cursor does not belong to this search (query, order and reverse must match)"
+            }
+    offset = max(offset or 0, 0)
+
     manager = get_manager()
-    try:
+
+    def work(path):
+        from anki.collection import BrowserColumns
+
         # Check accessibility first
-        manager.check_collection_accessible(collection_path)
-        with manager.get_collection(collection_path) as col:
-            note_ids = col.find_notes(query)
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
+            sort_column = False
+            if order:
+                sort_column = col.get_browser_column(order)
+                if sort_column is None or sort_column.sorting_notes == BrowserColumns.SORTING_NONE:
+                    return {
+                        "success": False,
+                        "error": f"Cannot sort notes by '{order}'",
+                        "available_orders": [
+                            column.key for column in col.all_browser_columns()
+                            if column.sorting_notes != BrowserColumns.SORTING_NONE
+                        ]
+                    }
+
+            all_note_ids = manager.find_notes_cached(col, query, sort_column, reverse)
+            total = len(all_note_ids)
 
-            # Apply limit
+            # Apply offset and limit
             if limit and limit > 0:
-                note_ids = note_ids[:limit]
+                note_ids = list(all_note_ids[offset:offset + limit])
+            else:
+                note_ids = list(all_note_ids[offset:])
+
+            next_offset = offset + len(note_ids)
+            next_cursor = None
+            if next_offset < total:
+                next_cursor = _encode_cursor(query, order, reverse, next_offset)
 
             return {
                 "success": True,
                 "note_ids": note_ids,
                 "count": len(note_ids),
+                "total": total,
+                "offset": offset,
+                "next_cursor": next_cursor,
                 "query": query
             }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def fulltext_search_tool(
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    filter_query: Optional[str] = None,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Search note text, best matches first, with a snippet of each match.
+
+    Searches a full-text index kept in a sidecar file next to the collection
+    (see mousetail.server.fulltext) rather than scanning every note as Anki's
+    search does. The index is built on first use and afterwards only
+    re-reads notes modified since it was last brought up to date.
+
+    Args:
+        query: Words to find, or an FTS5 query (e.g., 'python AND NOT snake',
+               '"exact phrase"', 'pyth*', 'first: python' to search only first fields).
+        limit: Maximum number of results to return. Default is 20.
+        offset: Number of results to skip.
+        filter_query: Only return notes also matching this Anki search query
+                      (e.g., 'deck:MyDeck').
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'note_ids' (list, best first), 'results'
+        (list of dicts with 'note_id', 'score' and 'snippet', matched words in
+        [brackets]), 'count' (int), 'offset' (int), 'index' (dict with the
+        notes 'indexed' and 'removed' to bring the index up to date) or
+        'error' (str).
+    """
+    offset = max(offset or 0, 0)
+    manager = get_manager()
+
+    def work(path):
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
+            index, refreshed = manager.get_fulltext_index(col)
+            end = offset + limit if limit and limit > 0 else None
+
+            if filter_query is None:
+                results = index.search(query, None if end is None else end - offset, offset)
+            else:
+                matched = set(manager.find_notes_cached(col, filter_query))
+                results = [result for result in index.search(query, None) if result['note_id'] in matched]
+                results = results[offset:end]
+
+            return {
+                "success": True,
+                "note_ids": [result['note_id'] for result in results],
+                "results": results,
+                "count": len(results),
+                "offset": offset,
+                "index": {
+                    "notes": index.notes,
+                    "indexed": refreshed['indexed'],
+                    "removed": refreshed['removed']
+                }
+            }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def similar_notes_tool(
+    note_id: Optional[int] = None,
+    text: Optional[str] = None,
+    limit: int = 10,
+    min_similarity: float = 0.0,
+    filter_query: Optional[str] = None,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Find the notes most similar to a note or to some text.
+
+    Similarity is the cosine of TF-IDF vectors computed locally from the
+    full-text index (see mousetail.server.fulltext), so no note has to be
+    read by the caller to find its near-duplicates or related notes.
+
+    Args:
+        note_id: Note to find neighbours of.
+        text: Text to find neighbours of, if no note_id is given.
+        limit: Maximum number of results to return. Default is 10.
+        min_similarity: Leave out notes less similar than this (0 to 1, e.g. 0.8
+                        for near-duplicates).
+        filter_query: Only return notes also matching this Anki search query
+                      (e.g., 'deck:MyDeck').
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'note_ids' (list, most similar first),
+        'results' (list of dicts with 'note_id', 'similarity' and
+        'first_field'), 'count' (int) or 'error' (str).
+    """
+    if (note_id is None) == (text is None):
+        return {
+            "success": False,
+            "error": "Give either note_id or text"
+        }
+
+    manager = get_manager()
+
+    def work(path):
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
+            index, _ = manager.get_fulltext_index(col)
+
+            allowed = None
+            if filter_query is not None:
+                allowed = set(manager.find_notes_cached(col, filter_query))
+            results = [
+                result for result in index.similar(note_id, text, None, allowed=allowed)
+                if result['similarity'] >= min_similarity
+            ]
+            if limit and limit > 0:
+                results = results[:limit]
+            for result in results:
+                result['first_field'] = _clip(result['first_field'])
+
+            return {
+                "success": True,
+                "note_ids": [result['note_id'] for result in results],
+                "results": results,
+                "count": len(results)
+            }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
     except Exception as e:
         return {
             "success": False,
@@ -295,24 +818,26 @@ async def get_note_tool(note_id: int, collection_path: Optional[str] = None) ->
         Dict with 'success' (bool), 'note' (dict with id, fields, tags, etc.) or 'error' (str).
     """
     manager = get_manager()
-    try:
+
+    def work(path):
         # Check accessibility first
-        manager.check_collection_accessible(collection_path)
-        with manager.get_collection(collection_path) as col:
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
             note = col.get_note(note_id)
+            metadata = manager.get_metadata(col)
 
             # Get note type
-            notetype = note.note_type()
+            notetype = metadata['notetypes'].get(note.mid) or note.note_type()
 
             # Build fields dictionary
             fields = {}
-            for i, field_name in enumerate(col.models.field_names(notetype)):
+            for i, field_name in enumerate(metadata['field_names'].get(note.mid) or col.models.field_names(notetype)):
                 fields[field_name] = note.fields[i] if i < len(note.fields) else ""
 
             # Get card info
             cards = note.cards()
             deck_id = cards[0].did if cards else None
-            deck_name = col.decks.get(deck_id)['name'] if deck_id else None
+            deck_name = metadata['deck_names'].get(deck_id) if deck_id else None
 
             return {
                 "success": True,
@@ -328,6 +853,142 @@ async def get_note_tool(note_id: int, collection_path: Optional[str] = None) ->
                     "card_ids": [card.id for card in cards]
                 }
             }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+NOTE_ATTRIBUTES = ("guid", "note_type", "deck", "tags", "card_ids", "modified")
+
+
+async def get_notes_tool(
+    note_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    fields: Optional[list[str]] = None,
+    attributes: Optional[list[str]] = None,
+    limit: int = 100,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Get information about many notes in one call.
+
+    Notes are read with a single query against the notes and cards tables.
+    Note types and deck names come from the collection's metadata cache
+    rather than being looked up per note.
+
+    Args:
+        note_ids: IDs of the notes to retrieve.
+        query: Anki search query used to select notes when note_ids is not given.
+        fields: Field names to include. If None, all fields are returned; an
+                empty list returns no fields.
+        attributes: Note attributes to include, any of 'guid', 'note_type',
+                    'deck', 'tags', 'card_ids' and 'modified'. If None, all are returned.
+        limit: Maximum number of notes to return for a query. Default is 100.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'notes' (list), 'count' (int),
+        'missing' (list of ids not found) or 'error' (str).
+    """
+    if note_ids is None and query is None:
+        return {
+            "success": False,
+            "error": "Either note_ids or query must be provided"
+        }
+
+    if attributes is None:
+        attributes = NOTE_ATTRIBUTES
+    unknown = [attribute for attribute in attributes if attribute not in NOTE_ATTRIBUTES]
+    if unknown:
+        return {
+            "success": False,
+            "error": f"Unknown attributes: {', '.join(unknown)}",
+            "available_attributes": list(NOTE_ATTRIBUTES)
+        }
+
+    manager = get_manager()
+
+    def work(path):
+        from anki.utils import ids2str
+
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
+            selected_ids = note_ids
+            if selected_ids is None:
+                selected_ids = col.find_notes(query)
+                if limit and limit > 0:
+                    selected_ids = selected_ids[:limit]
+
+            rows = {}
+            cards = {}
+            if selected_ids:
+                id_list = ids2str(selected_ids)
+                for nid, guid, mid, mod, tags, flds in col.db.execute(
+                    f"select id, guid, mid, mod, tags, flds from notes where id in {id_list}"
+                ):
+                    rows[nid] = (guid, mid, mod, tags, flds)
+                if "deck" in attributes or "card_ids" in attributes:
+                    for nid, cid, did in col.db.execute(
+                        f"select nid, id, did from cards where nid in {id_list} order by nid, ord"
+                    ):
+                        cards.setdefault(nid, []).append((cid, did))
+
+            metadata = manager.get_metadata(col)
+
+            notes = []
+            missing = []
+            for nid in selected_ids:
+                row = rows.get(nid)
+                if row is None:
+                    missing.append(nid)
+                    continue
+                guid, mid, mod, tags, flds = row
+
+                notetype = metadata['notetypes'].get(mid)
+                notetype_name = notetype['name'] if notetype else None
+                field_names = metadata['field_names'].get(mid, [])
+
+                note = {"id": nid}
+                if fields is None or fields:
+                    values = flds.split("\x1f")
+                    note["fields"] = {
+                        name: values[i] if i < len(values) else ""
+                        for i, name in enumerate(field_names)
+                        if fields is None or name in fields
+                    }
+                if "guid" in attributes:
+                    note["guid"] = guid
+                if "note_type" in attributes:
+                    note["note_type_id"] = mid
+                    note["note_type_name"] = notetype_name
+                if "deck" in attributes:
+                    note_cards = cards.get(nid)
+                    deck_id = note_cards[0][1] if note_cards else None
+                    note["deck_id"] = deck_id
+                    note["deck_name"] = metadata['deck_names'].get(deck_id)
+                if "tags" in attributes:
+                    note["tags"] = tags.split()
+                if "card_ids" in attributes:
+                    note["card_ids"] = [cid for cid, _ in cards.get(nid, [])]
+                if "modified" in attributes:
+                    note["modified"] = mod
+
+                notes.append(note)
+
+            return {
+                "success": True,
+                "notes": notes,
+                "count": len(notes),
+                "missing": missing
+            }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
     except Exception as e:
         return {
             "success": False,
@@ -353,10 +1014,11 @@ async def update_note_tool(
         Dict with 'success' (bool), 'message' (str) or 'error' (str).
     """
     manager = get_manager()
-    try:
+
+    def work(path):
         # Check accessibility first
-        manager.check_collection_accessible(collection_path)
-        with manager.get_collection(collection_path) as col:
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path) as col:
             note = col.get_note(note_id)
 
             # Update fields if provided
@@ -383,12 +1045,17 @@ async def update_note_tool(
                     note.add_tag(tag)
 
             # Save changes
+            mod = col.mod
             col.update_note(note)
+            manager.update_duplicate_index(col, [note.id], mod)
 
             return {
                 "success": True,
                 "message": "Note updated successfully"
             }
+
+    try:
+        return await manager.run(work, collection_path)
     except Exception as e:
         return {
             "success": False,
@@ -396,42 +1063,1368 @@ async def update_note_tool(
         }
 
 
-# Sync-related helper functions and tools
+PATCH_OPS = ("set", "append", "prepend", "regex", "find_replace")
 
-KEYRING_SERVICE_NAME = "mousetail-anki-sync"
+# Changed fields shown by a dry run, and how much of each value
+DIFF_SAMPLE_SIZE = 20
+DIFF_VALUE_LENGTH = 200
 
 
-def _load_config() -> dict:
-    """Load configuration from config.json.
+def _anki_replacement(replacement: str) -> str:
+    """Convert an Anki (Rust regex) replacement like '$1' or '${name}' to Python's syntax."""
+    replacement = replacement.replace("\\", "\\\\")
 
-    Returns:
-        Dict with configuration data, or empty dict if file doesn't exist.
+    def convert(match):
+        if match.group(0) == "$$":
+            return "$"
+        return f"\\g<{match.group(1) or match.group(2)}>"
+
+    return re.sub(r"\$(?:\$|\{(\w+)\}|(\d+))", convert, replacement)
+
+
+def _check_replacement(pattern: re.Pattern, template: str, replacement: str):
+    """Make sure a replacement template only refers to groups the pattern has.
+
+    Raises:
+        ValueError: If it doesn't, rather than failing on the first matching note.
     """
     try:
-        # Look for config.json in the project root
-        config_path = Path(__file__).parent.parent.parent / "config.json"
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {}
+        # The template is parsed even though nothing matches
+        pattern.sub(template, "")
+    except (re.error, IndexError) as e:
+        raise ValueError(f"Invalid replacement '{replacement}' for regex '{pattern.pattern}': {e}")
 
 
-def _get_sync_endpoint_from_config() -> Optional[str]:
-    """Get the preferred sync endpoint from config.
+def _compile_patch(patch: dict):
+    """Turn a patch operation into (field name or None for all fields, function).
 
-    Returns:
-        Endpoint URL string or None for AnkiWeb.
+    Raises:
+        ValueError: If the patch is incomplete or its regex or replacement is invalid.
     """
-    config = _load_config()
-    return config.get("sync", {}).get("endpoint")
+    op = patch.get("op")
+    field = patch.get("field")
+    if op not in PATCH_OPS:
+        raise ValueError(f"Unknown patch op '{op}', expected one of: {', '.join(PATCH_OPS)}")
+    if op != "find_replace" and not field:
+        raise ValueError(f"Patch op '{op}' needs a 'field'")
+
+    if op in ("set", "append", "prepend"):
+        value = patch.get("value")
+        if value is None:
+            raise ValueError(f"Patch op '{op}' needs a 'value'")
+        if op == "set":
+            return field, lambda text: value
+        if op == "append":
+            return field, lambda text: text + value
+        return field, lambda text: value + text
+
+    if op == "regex":
+        if patch.get("pattern") is None or patch.get("replacement") is None:
+            raise ValueError("Patch op 'regex' needs a 'pattern' and a 'replacement'")
+        flags = re.IGNORECASE if patch.get("ignore_case") else 0
+        try:
+            pattern = re.compile(patch["pattern"], flags)
+        except re.error as e:
+            raise ValueError(f"Invalid regex '{patch['pattern']}': {e}")
+        replacement = patch["replacement"]
+        _check_replacement(pattern, replacement, replacement)
+        return field, lambda text: pattern.sub(replacement, text)
+
+    # find_replace follows Anki's Find and Replace: literal and case
+    # insensitive unless asked otherwise, in one field or all of them
+    search = patch.get("search")
+    replacement = patch.get("replacement")
+    if not search or replacement is None:
+        raise ValueError("Patch op 'find_replace' needs a 'search' and a 'replacement'")
+    flags = 0 if patch.get("match_case") else re.IGNORECASE
+    if patch.get("regex"):
+        try:
+            pattern = re.compile(search, flags)
+        except re.error as e:
+            raise ValueError(f"Invalid regex '{search}': {e}")
+        template = _anki_replacement(replacement)
+        _check_replacement(pattern, template, replacement)
+        return field, lambda text: pattern.sub(template, text)
+    pattern = re.compile(re.escape(search), flags)
+    return field, lambda text: pattern.sub(lambda match: replacement, text)
+
+
+def _clip(text: str) -> str:
+    """Shorten a field value for a diff sample."""
+    if len(text) <= DIFF_VALUE_LENGTH:
+        return text
+    return text[:DIFF_VALUE_LENGTH] + "…"
+
+
+async def update_notes_tool(
+    patches: list[dict],
+    note_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    dry_run: bool = False,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Apply field patches to many notes in one transaction.
 
+    Each patch is a dict with an 'op':
 
-async def save_sync_credentials_tool(
-    username: str,
-    password: str,
-    endpoint: Optional[str] = None
+    - ``set``: replace 'field' with 'value'
+    - ``append`` / ``prepend``: add 'value' to the end / start of 'field'
+    - ``regex``: Python regular expression 'pattern' replaced with
+      'replacement' (``\\1`` for groups) in 'field'; 'ignore_case' optional
+    - ``find_replace``: Anki's Find and Replace: 'search' replaced with
+      'replacement' in 'field', or in every field if no field is given.
+      Literal and case insensitive unless 'regex' (``$1`` for groups) or
+      'match_case' is true.
+
+    Patches are applied in order. Fields are read straight from the notes
+    table and only notes that actually change are saved, all through a
+    single ``col.update_notes`` call (one undo step). Notes whose type lacks
+    a patched field are left alone by that patch.
+
+    Args:
+        patches: Patch operations, as above.
+        note_ids: IDs of the notes to patch.
+        query: Anki search query selecting the notes when note_ids is not given.
+        dry_run: Only report what would change.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'matched', 'changed' and 'unchanged'
+        (int), 'fields_changed' (field name -> notes changed), 'missing_fields'
+        (field name -> notes without it), 'missing' (ids not found), 'dry_run',
+        and for dry runs 'sample' (up to 20 changes with 'note_id', 'field',
+        'before' and 'after'); or 'error' (str).
+    """
+    if note_ids is None and query is None:
+        return {
+            "success": False,
+            "error": "Either note_ids or query must be provided"
+        }
+    if not patches:
+        return {
+            "success": False,
+            "error": "No patches given"
+        }
+
+    compiled = []
+    for number, patch in enumerate(patches, 1):
+        try:
+            compiled.append(_compile_patch(patch))
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": f"Patch {number} ({patch.get('op')}): {e}"
+            }
+
+    manager = get_manager()
+
+    def work(path):
+        from anki.utils import ids2str
+
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=dry_run) as col:
+            selected_ids = note_ids if note_ids is not None else col.find_notes(query)
+
+            rows = {}
+            if selected_ids:
+                for nid, mid, flds in col.db.execute(
+                    f"select id, mid, flds from notes where id in {ids2str(selected_ids)}"
+                ):
+                    rows[nid] = (mid, flds)
+
+            field_names = manager.get_metadata(col)['field_names']
+            changes = {}
+            fields_changed = {}
+            missing_fields = {}
+            sample = []
+            missing = []
+
+            for nid in selected_ids:
+                row = rows.get(nid)
+                if row is None:
+                    missing.append(nid)
+                    continue
+                mid, flds = row
+                names = field_names.get(mid) or col.models.field_names(col.models.get(mid))
+                original = flds.split("\x1f")
+                values = list(original)
+
+                for field, apply in compiled:
+                    if field is None:
+                        indexes = range(len(values))
+                    elif field in names:
+                        indexes = (names.index(field),)
+                    else:
+                        missing_fields[field] = missing_fields.get(field, 0) + 1
+                        continue
+                    for index in indexes:
+                        values[index] = apply(values[index])
+
+                if values == original:
+                    continue
+                changes[nid] = values
+                for index, (before, after) in enumerate(zip(original, values)):
+                    if before != after:
+                        name = names[index] if index < len(names) else str(index)
+                        fields_changed[name] = fields_changed.get(name, 0) + 1
+                        if dry_run and len(sample) < DIFF_SAMPLE_SIZE:
+                            sample.append({
+                                "note_id": nid,
+                                "field": name,
+                                "before": _clip(before),
+                                "after": _clip(after)
+                            })
+
+            if changes and not dry_run:
+                notes = []
+                for nid, values in changes.items():
+                    note = col.get_note(nid)
+                    note.fields = values
+                    notes.append(note)
+                mod = col.mod
+                col.update_notes(notes)
+                manager.update_duplicate_index(col, list(changes), mod)
+
+            result = {
+                "success": True,
+                "dry_run": dry_run,
+                "matched": len(selected_ids) - len(missing),
+                "changed": len(changes),
+                "unchanged": len(selected_ids) - len(missing) - len(changes),
+                "fields_changed": fields_changed,
+                "missing_fields": missing_fields,
+                "missing": missing
+            }
+            if dry_run:
+                result["sample"] = sample
+            return result
+
+    try:
+        return await manager.run(work, collection_path, read_only=dry_run)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def find_duplicates_tool(
+    note_type: Optional[str] = None,
+    query: Optional[str] = None,
+    limit: int = 50,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Find groups of notes that duplicate each other.
+
+    Notes are duplicates if they have the same note type and the same first
+    field, ignoring HTML, case and extra whitespace. Groups come from one
+    pass over the collection's duplicate index, not from comparing notes
+    with each other.
+
+    Args:
+        note_type: Only report duplicates of this note type.
+        query: Only consider notes matching this Anki search query.
+        limit: Maximum number of groups to return, largest first. Default is 50.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'groups' (list of dicts with 'note_type',
+        'first_field' and 'note_ids', oldest note first), 'group_count' (int,
+        all groups found), 'duplicate_count' (int, notes beyond the first of
+        each group) or 'error' (str).
+    """
+    manager = get_manager()
+
+    def work(path):
+        from anki.utils import ids2str
+
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
+            groups = manager.duplicate_groups(col)
+
+            if query is not None:
+                matched = set(manager.find_notes_cached(col, query))
+                groups = [group for group in ([nid for nid in nids if nid in matched] for nids in groups) if len(group) > 1]
+
+            # Every note of a group has the same note type; look up one per group
+            first_notes = {}
+            if groups:
+                for nid, mid, flds in col.db.execute(
+                    f"select id, mid, flds from notes where id in {ids2str(min(group) for group in groups)}"
+                ):
+                    first_notes[nid] = (mid, flds.split("\x1f", 1)[0])
+
+            metadata = manager.get_metadata(col)
+            if note_type is not None:
+                notetype = manager.find_notetype(col, note_type)
+                if not notetype:
+                    return {
+                        "success": False,
+                        "error": f"Note type '{note_type}' not found"
+                    }
+                groups = [group for group in groups if first_notes.get(min(group), (None,))[0] == notetype['id']]
+
+            groups.sort(key=lambda group: (-len(group), min(group)))
+            results = []
+            for group in groups[:limit] if limit and limit > 0 else groups:
+                mid, first_field = first_notes.get(min(group), (None, ""))
+                notetype = metadata['notetypes'].get(mid)
+                results.append({
+                    "note_type": notetype['name'] if notetype else None,
+                    "first_field": _clip(first_field),
+                    "note_ids": sorted(group)
+                })
+
+            return {
+                "success": True,
+                "groups": results,
+                "group_count": len(groups),
+                "duplicate_count": sum(len(group) - 1 for group in groups)
+            }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+# Tag tools
+
+
+def _select_note_ids(col, note_ids: Optional[list[int]], query: Optional[str]):
+    """Get the notes a bulk tool applies to: the given IDs, or the query's matches."""
+    if note_ids is not None:
+        return note_ids
+    return get_manager().find_notes_cached(col, query)
+
+
+async def _bulk_tag_op(
+    apply,
+    note_ids: Optional[list[int]],
+    query: Optional[str],
+    collection_path: Optional[str]
+) -> dict:
+    """Run apply(col, note_ids) -> OpChangesWithCount on the selected notes.
+
+    Returns:
+        Dict with 'success', 'matched' and 'changed', or 'error'.
+    """
+    if note_ids is None and query is None:
+        return {
+            "success": False,
+            "error": "Either note_ids or query must be provided"
+        }
+
+    manager = get_manager()
+
+    def work(path):
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path) as col:
+            selected_ids = list(_select_note_ids(col, note_ids, query))
+            mod = col.mod
+            changed = apply(col, selected_ids).count if selected_ids else 0
+            # Tags don't affect duplicates; just keep the index current
+            manager.update_duplicate_index(col, [], mod)
+            return {
+                "success": True,
+                "matched": len(selected_ids),
+                "changed": changed
+            }
+
+    try:
+        return await manager.run(work, collection_path)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def add_tags_tool(
+    tags: list[str],
+    note_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Add tags to every note matching a query or ID list, in one operation.
+
+    Args:
+        tags: Tags to add.
+        note_ids: IDs of the notes to tag.
+        query: Anki search query selecting the notes when note_ids is not given.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'matched' and 'changed' (int, notes that
+        didn't already have the tags) or 'error' (str).
+    """
+    if not tags:
+        return {
+            "success": False,
+            "error": "No tags given"
+        }
+    return await _bulk_tag_op(
+        lambda col, nids: col.tags.bulk_add(nids, " ".join(tags)),
+        note_ids, query, collection_path
+    )
+
+
+async def remove_tags_tool(
+    tags: list[str],
+    note_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Remove tags from every note matching a query or ID list, in one operation.
+
+    Tags are matched case-insensitively, and removing a tag also removes its
+    child tags (``lang`` removes ``lang::fr``).
+
+    Args:
+        tags: Tags to remove.
+        note_ids: IDs of the notes to untag.
+        query: Anki search query selecting the notes when note_ids is not given.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'matched' and 'changed' (int) or 'error' (str).
+    """
+    if not tags:
+        return {
+            "success": False,
+            "error": "No tags given"
+        }
+    return await _bulk_tag_op(
+        lambda col, nids: col.tags.bulk_remove(nids, " ".join(tags)),
+        note_ids, query, collection_path
+    )
+
+
+async def replace_tags_tool(
+    search: str,
+    replacement: str,
+    note_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    regex: bool = False,
+    match_case: bool = False,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Find and replace within the tags of every note matching a query or ID list.
+
+    Works like Find and Replace on tags in Anki's browser: each tag is matched
+    separately, and a tag replaced by an empty string is removed.
+
+    Args:
+        search: Text, or regular expression if regex is true, to find in tags.
+        replacement: Replacement text (``$1`` refers to regex groups).
+        note_ids: IDs of the notes to change.
+        query: Anki search query selecting the notes when note_ids is not given.
+        regex: Treat search as a regular expression.
+        match_case: Match case-sensitively.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'matched' and 'changed' (int) or 'error' (str).
+    """
+    if not search:
+        return {
+            "success": False,
+            "error": "No search text given"
+        }
+    return await _bulk_tag_op(
+        lambda col, nids: col.tags.find_and_replace(nids, search, replacement, regex, match_case),
+        note_ids, query, collection_path
+    )
+
+
+async def rename_tag_tool(old_tag: str, new_tag: str, collection_path: Optional[str] = None) -> dict:
+    """Rename a tag and its child tags on every note in the collection.
+
+    Renaming ``lang::fr`` to ``french`` also turns ``lang::fr::verbs`` into
+    ``french::verbs``. To rename a tag on only some notes, use replace_tags.
+
+    Args:
+        old_tag: Tag to rename.
+        new_tag: New name.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'changed' (int, notes updated) or 'error' (str).
+    """
+    if not old_tag or not new_tag:
+        return {
+            "success": False,
+            "error": "Both old_tag and new_tag must be provided"
+        }
+
+    manager = get_manager()
+
+    def work(path):
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path) as col:
+            mod = col.mod
+            changed = col.tags.rename(old_tag, new_tag).count
+            manager.update_duplicate_index(col, [], mod)
+            return {
+                "success": True,
+                "old_tag": old_tag,
+                "new_tag": new_tag,
+                "changed": changed
+            }
+
+    try:
+        return await manager.run(work, collection_path)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def list_tags_tool(prefix: Optional[str] = None, collection_path: Optional[str] = None) -> dict:
+    """List the collection's tags with the number of notes carrying each.
+
+    Counts come from a tag index that is rebuilt only after the collection
+    changes, so repeated listings are cheap.
+
+    Args:
+        prefix: Only list tags starting with this text (case-insensitive),
+                e.g. 'lang::' for the children of 'lang'.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'tags' (list of dicts with 'name' and
+        'note_count'), 'count' (int) or 'error' (str).
+    """
+    manager = get_manager()
+
+    def work(path):
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
+            tag_counts = manager.get_tag_counts(col)
+            folded = prefix.casefold() if prefix else None
+            tags = [
+                {"name": name, "note_count": count}
+                for name, count in tag_counts.items()
+                if folded is None or name.casefold().startswith(folded)
+            ]
+            return {
+                "success": True,
+                "tags": tags,
+                "count": len(tags)
+            }
+
+    try:
+        return await manager.run(work, collection_path, read_only=True)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+# Bulk card and note tools
+
+# Cards or notes changed per backend operation. The writer lock is released
+# between chunks, so other calls get a turn during a long bulk change.
+BULK_CHUNK_SIZE = 1000
+
+
+async def _run_bulk(
+    kind: str,
+    select,
+    apply,
+    collection_path: Optional[str],
+    background: bool,
+    notes: bool = False
+) -> dict:
+    """Apply a bulk change in chunks, each one backend operation.
+
+    Args:
+        kind: Job kind used when running in the background.
+        select: select(col) -> IDs to change; runs on a reader and may raise
+            ValueError to reject the request.
+        apply: apply(col, chunk) -> number of items changed in the chunk.
+        collection_path: Path to collection file, or None for the default.
+        background: Start a job and return it instead of waiting.
+        notes: The IDs are of notes whose first fields change (or that are
+            deleted), rather than of cards.
+
+    Returns:
+        Dict with 'success', 'matched', 'changed' and 'chunks'; or 'job';
+        or 'error'.
+    """
+    manager = get_manager()
+
+    def select_work(path):
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        with manager.get_collection(path, read_only=True) as col:
+            return list(select(col))
+
+    def chunk_work(path, chunk):
+        with manager.get_collection(path) as col:
+            mod = col.mod
+            changed = apply(col, chunk)
+            manager.update_duplicate_index(col, chunk if notes else [], mod)
+            return changed
+
+    def chunks(ids):
+        return [ids[start:start + BULK_CHUNK_SIZE] for start in range(0, len(ids), BULK_CHUNK_SIZE)]
+
+    def run_job(job):
+        path = job['path']
+        job['phase'] = 'selecting'
+        ids = manager.submit(select_work, path, read_only=True).result()
+        batches = chunks(ids)
+        changed = 0
+        job['phase'] = 'applying'
+        job['progress'] = {'total': len(ids), 'done': 0, 'changed': 0}
+        for chunk in batches:
+            changed += manager.submit(lambda p: chunk_work(p, chunk), path).result()
+            job['progress'] = {
+                'total': len(ids),
+                'done': job['progress']['done'] + len(chunk),
+                'changed': changed
+            }
+        return {
+            "success": True,
+            "matched": len(ids),
+            "changed": changed,
+            "chunks": len(batches)
+        }
+
+    try:
+        if background:
+            job = manager.start_job(kind, run_job, collection_path, exclusive=False)
+            return {
+                "success": True,
+                "job": job
+            }
+
+        path = manager.resolve_path(collection_path)
+        ids = await manager.run(select_work, path, read_only=True)
+        batches = chunks(ids)
+        changed = 0
+        for chunk in batches:
+            changed += await manager.run(lambda p: chunk_work(p, chunk), path)
+        return {
+            "success": True,
+            "matched": len(ids),
+            "changed": changed,
+            "chunks": len(batches)
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+def _select_card_ids(col, card_ids: Optional[list[int]], query: Optional[str]):
+    """Get the cards a bulk tool applies to: the given IDs, or the query's matches."""
+    if card_ids is not None:
+        return card_ids
+    return col.find_cards(query)
+
+
+async def move_cards_tool(
+    deck_name: str,
+    card_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    background: bool = False,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Move cards to another deck.
+
+    Cards are moved in chunks of 1000, each one backend operation (and one
+    undo step), so other tool calls aren't held up for the whole move.
+
+    Args:
+        deck_name: Name of the destination deck (must exist).
+        card_ids: IDs of the cards to move.
+        query: Anki search query selecting the cards when card_ids is not given.
+        background: Return a job straight away; poll job_status_tool for
+            progress and the result.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'matched', 'changed' and 'chunks' (int),
+        or 'job' (dict) when background is true, or 'error' (str).
+    """
+    if card_ids is None and query is None:
+        return {
+            "success": False,
+            "error": "Either card_ids or query must be provided"
+        }
+
+    manager = get_manager()
+
+    def select(col):
+        if manager.find_deck_id(col, deck_name) is None:
+            raise ValueError(f"Deck '{deck_name}' not found")
+        return _select_card_ids(col, card_ids, query)
+
+    def apply(col, chunk):
+        return col.set_deck(chunk, manager.find_deck_id(col, deck_name)).count
+
+    return await _run_bulk("move_cards", select, apply, collection_path, background)
+
+
+async def suspend_cards_tool(
+    card_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    background: bool = False,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Suspend cards, in chunks of 1000 per backend operation.
+
+    Args:
+        card_ids: IDs of the cards to suspend.
+        query: Anki search query selecting the cards when card_ids is not given.
+        background: Return a job straight away; poll job_status_tool for
+            progress and the result.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'matched', 'changed' (cards newly
+        suspended) and 'chunks' (int), or 'job' (dict) when background is
+        true, or 'error' (str).
+    """
+    if card_ids is None and query is None:
+        return {
+            "success": False,
+            "error": "Either card_ids or query must be provided"
+        }
+
+    return await _run_bulk(
+        "suspend_cards",
+        lambda col: _select_card_ids(col, card_ids, query),
+        lambda col, chunk: col.sched.suspend_cards(chunk).count,
+        collection_path, background
+    )
+
+
+async def unsuspend_cards_tool(
+    card_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    background: bool = False,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Unsuspend cards, in chunks of 1000 per backend operation.
+
+    Args:
+        card_ids: IDs of the cards to unsuspend.
+        query: Anki search query selecting the cards when card_ids is not given.
+        background: Return a job straight away; poll job_status_tool for
+            progress and the result.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'matched', 'changed' (cards that were
+        suspended) and 'chunks' (int), or 'job' (dict) when background is
+        true, or 'error' (str).
+    """
+    if card_ids is None and query is None:
+        return {
+            "success": False,
+            "error": "Either card_ids or query must be provided"
+        }
+
+    def apply(col, chunk):
+        from anki.consts import QUEUE_TYPE_SUSPENDED
+        from anki.utils import ids2str
+
+        # Anki doesn't report how many cards it unsuspended
+        suspended = col.db.scalar(
+            f"select count() from cards where queue = {QUEUE_TYPE_SUSPENDED} and id in {ids2str(chunk)}"
+        )
+        col.sched.unsuspend_cards(chunk)
+        return suspended
+
+    return await _run_bulk(
+        "unsuspend_cards",
+        lambda col: _select_card_ids(col, card_ids, query),
+        apply,
+        collection_path, background
+    )
+
+
+async def delete_notes_tool(
+    note_ids: Optional[list[int]] = None,
+    query: Optional[str] = None,
+    background: bool = False,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Delete notes and all their cards, in chunks of 1000 per backend operation.
+
+    Args:
+        note_ids: IDs of the notes to delete.
+        query: Anki search query selecting the notes when note_ids is not
+               given. An empty query is refused; use 'deck:*' to really
+               delete every note.
+        background: Return a job straight away; poll job_status_tool for
+            progress and the result.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'matched', 'changed' (notes deleted) and
+        'chunks' (int), or 'job' (dict) when background is true, or 'error' (str).
+    """
+    if note_ids is None and query is None:
+        return {
+            "success": False,
+            "error": "Either note_ids or query must be provided"
+        }
+    if note_ids is None and not query.strip():
+        return {
+            "success": False,
+            "error": "Refusing to delete with an empty query; use 'deck:*' to delete every note"
+        }
+
+    return await _run_bulk(
+        "delete_notes",
+        lambda col: _select_note_ids(col, note_ids, query),
+        lambda col, chunk: col.remove_notes(chunk).count,
+        collection_path, background, notes=True
+    )
+
+
+async def job_status_tool(
+    job_id: Optional[str] = None,
+    kind: Optional[str] = None,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Report the progress or result of background jobs of any kind.
+
+    Args:
+        job_id: Job ID returned by a tool started with background=True (or
+            by start_sync_tool). If None, reports the recent jobs.
+        kind: Only report jobs of this kind, e.g. 'move_cards' or 'sync'.
+        collection_path: Only report jobs for this collection.
+
+    Returns:
+        Dict with 'success' (bool) and 'job' (dict) or 'jobs' (list of dicts),
+        or 'error' (str). A job has 'id', 'kind', 'status' (running,
+        succeeded or failed), 'phase', 'progress', 'result' and 'error'.
+    """
+    manager = get_manager()
+
+    if job_id is not None:
+        job = manager.get_job(job_id)
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Job {job_id} not found"
+            }
+        return {
+            "success": True,
+            "job": job
+        }
+
+    try:
+        path = manager.resolve_path(collection_path) if collection_path else None
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+    jobs = [job for job in manager.list_jobs(kind) if path is None or job['path'] == path]
+    return {
+        "success": True,
+        "jobs": jobs
+    }
+
+
+# Export and import tools
+
+EXPORT_FORMATS = ("jsonl", "csv")
+
+# Notes read per chunk while exporting
+EXPORT_CHUNK_SIZE = 1000
+
+# Leading CSV columns; the note fields follow
+CSV_COLUMNS = ("id", "guid", "note_type", "deck", "tags", "modified")
+
+
+def _file_format(path: Path, file_format: Optional[str]) -> str:
+    """Get the file format, from the argument or else the file's extension.
+
+    Raises:
+        ValueError: If the format isn't one of EXPORT_FORMATS.
+    """
+    file_format = (file_format or path.suffix.lstrip(".") or "jsonl").lower()
+    if file_format == "json":
+        file_format = "jsonl"
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{file_format}', expected one of: {', '.join(EXPORT_FORMATS)}")
+    return file_format
+
+
+async def export_notes_tool(
+    query: str,
+    output_path: str,
+    file_format: Optional[str] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    overwrite: bool = False,
+    background: bool = False,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Export the notes matching a query to a JSONL or CSV file.
+
+    Notes are read and written in chunks, each chunk with one query against
+    the notes and cards tables, so memory use stays flat however many notes
+    match and writes to the collection can run between chunks. Note type
+    and deck names come from the metadata cache. The file is written under
+    a temporary name and renamed when complete.
+
+    Each JSONL line is an object with 'id', 'guid', 'note_type', 'deck',
+    'tags' (list), 'modified' and 'fields' (field name -> value). CSV files
+    have those columns, with tags space-separated, followed by one column
+    per field of the note types exported.
+
+    Args:
+        query: Anki search query selecting the notes (e.g. 'deck:Spanish').
+        output_path: File to write.
+        file_format: 'jsonl' or 'csv'. If None, taken from the file extension.
+        chunk_size: Notes read per chunk.
+        overwrite: Replace output_path if it exists.
+        background: Return a job straight away; poll job_status_tool for
+            progress and the result.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'path' (str), 'format' (str), 'rows',
+        'chunks' and 'bytes' (int), 'seconds' and 'rows_per_second' (float),
+        or 'job' (dict) when background is true, or 'error' (str).
+    """
+    output = Path(output_path).expanduser().resolve()
+    try:
+        file_format = _file_format(output, file_format)
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+    if output.exists() and not overwrite:
+        return {
+            "success": False,
+            "error": f"{output} already exists (pass overwrite to replace it)"
+        }
+    if not output.parent.is_dir():
+        return {
+            "success": False,
+            "error": f"Directory {output.parent} does not exist"
+        }
+    chunk_size = max(1, chunk_size)
+
+    manager = get_manager()
+
+    def select(path):
+        from anki.utils import ids2str
+
+        with manager.get_collection(path, read_only=True) as col:
+            note_ids = sorted(col.find_notes(query))
+            field_names = []
+            if file_format == "csv":
+                # One column per field of the note types being exported
+                metadata = manager.get_metadata(col)
+                mids = set()
+                for start in range(0, len(note_ids), chunk_size):
+                    chunk = note_ids[start:start + chunk_size]
+                    mids.update(col.db.list(f"select distinct mid from notes where id in {ids2str(chunk)}"))
+                for mid in sorted(mids):
+                    for name in metadata['field_names'].get(mid, []):
+                        if name not in field_names:
+                            field_names.append(name)
+            return note_ids, field_names
+
+    def read_chunk(path, chunk):
+        from anki.utils import ids2str
+
+        with manager.get_collection(path, read_only=True) as col:
+            metadata = manager.get_metadata(col)
+            id_list = ids2str(chunk)
+            decks = {}
+            for nid, did in col.db.execute(
+                f"select nid, did from cards where nid in {id_list} order by nid, ord"
+            ):
+                decks.setdefault(nid, did)
+
+            notes = []
+            for nid, guid, mid, mod, tags, flds in col.db.execute(
+                f"select id, guid, mid, mod, tags, flds from notes where id in {id_list} order by id"
+            ):
+                notetype = metadata['notetypes'].get(mid)
+                values = flds.split("\x1f")
+                notes.append({
+                    "id": nid,
+                    "guid": guid,
+                    "note_type": notetype['name'] if notetype else None,
+                    "deck": metadata['deck_names'].get(decks.get(nid)),
+                    "tags": tags.split(),
+                    "modified": mod,
+                    "fields": dict(zip(metadata['field_names'].get(mid, []), values))
+                })
+            return notes
+
+    def work(path, job=None):
+        import csv
+
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        started = time.monotonic()
+        note_ids, field_names = select(path)
+
+        partial = output.with_name(output.name + ".part")
+        rows = 0
+        chunks = 0
+        try:
+            with open(partial, "w", encoding="utf-8", newline="") as f:
+                writer = None
+                if file_format == "csv":
+                    writer = csv.writer(f)
+                    writer.writerow(CSV_COLUMNS + tuple(field_names))
+
+                for start in range(0, len(note_ids), chunk_size):
+                    # The collection is released between chunks
+                    notes = read_chunk(path, note_ids[start:start + chunk_size])
+                    for note in notes:
+                        if writer is None:
+                            f.write(json.dumps(note, ensure_ascii=False) + "\n")
+                        else:
+                            writer.writerow(
+                                [note["id"], note["guid"], note["note_type"], note["deck"],
+                                 " ".join(note["tags"]), note["modified"]]
+                                + [note["fields"].get(name, "") for name in field_names]
+                            )
+                    rows += len(notes)
+                    chunks += 1
+                    if job is not None:
+                        job['progress'] = {'total': len(note_ids), 'done': rows}
+            partial.replace(output)
+        finally:
+            partial.unlink(missing_ok=True)
+
+        seconds = time.monotonic() - started
+        return {
+            "success": True,
+            "path": str(output),
+            "format": file_format,
+            "rows": rows,
+            "chunks": chunks,
+            "bytes": output.stat().st_size,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(rows / seconds) if seconds > 0 else None
+        }
+
+    try:
+        if background:
+            job = manager.start_job("export", lambda job: work(job['path'], job), collection_path, exclusive=False)
+            return {
+                "success": True,
+                "job": job
+            }
+        return await manager.run(work, collection_path, read_only=True)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+# Rows added per transaction while importing
+IMPORT_CHUNK_SIZE = 500
+
+
+def _read_rows(f, file_format: str):
+    """Yield (row number, row dict or error message) from an import file."""
+    import csv
+
+    if file_format == "csv":
+        for number, row in enumerate(csv.DictReader(f), start=1):
+            if None in row:
+                yield number, "Row has more values than the header has columns"
+            else:
+                yield number, row
+        return
+
+    number = 0
+    for line in f:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, "Row is not a JSON object"
+            continue
+        yield number, row
+
+
+def _row_spec(
+    row: dict,
+    field_map: Optional[dict],
+    note_type: Optional[str],
+    deck_name: Optional[str]
+) -> dict:
+    """Turn an import row (as export_notes_tool writes them) into a note spec."""
+    if isinstance(row.get("fields"), dict):
+        fields = row["fields"]
+    else:
+        fields = {column: value for column, value in row.items() if column not in CSV_COLUMNS}
+    if field_map:
+        fields = {field_map[column]: value for column, value in fields.items() if column in field_map}
+
+    tags = row.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.split()
+
+    return {
+        "note_type_name": note_type or row.get("note_type"),
+        "deck_name": deck_name or row.get("deck"),
+        "fields": {name: "" if value is None else str(value) for name, value in fields.items()},
+        "tags": tags
+    }
+
+
+async def import_notes_tool(
+    input_path: str,
+    note_type: Optional[str] = None,
+    deck_name: Optional[str] = None,
+    field_map: Optional[dict[str, str]] = None,
+    file_format: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    resume: bool = True,
+    error_path: Optional[str] = None,
+    background: bool = False,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Import notes from a JSONL or CSV file.
+
+    The file is read as a stream and the notes are added in chunks, each
+    one ``col.add_notes`` transaction, so the writer lock is released
+    between chunks and memory use stays flat. Files written by
+    export_notes_tool can be imported as they are.
+
+    Each JSONL line is an object whose 'fields' (or, without 'fields', its
+    other keys) give the field values; a CSV file's header names its
+    columns. The columns 'note_type', 'deck' and 'tags' (a list, or
+    space-separated) are used as such, and 'id', 'guid' and 'modified' are
+    ignored. Other columns are fields, renamed by field_map if given (columns
+    it doesn't mention are dropped). Empty columns not in a row's note type
+    are skipped, so an export mixing note types imports cleanly.
+
+    After every chunk, progress is saved to ``<input_path>.checkpoint``. If
+    an import is interrupted, running it again with resume picks up after
+    the last completed chunk (a chunk cut off by a crash between its commit
+    and the checkpoint may be added again). The checkpoint is removed when
+    the import completes. Rows that can't be added are written to the error
+    file with their row number, the reason and the row itself.
+
+    Args:
+        input_path: File to import.
+        note_type: Note type for every row, overriding a 'note_type' column.
+        deck_name: Deck for every row, overriding a 'deck' column.
+        field_map: Column name -> field name, for files whose columns
+                   aren't named after the fields.
+        file_format: 'jsonl' or 'csv'. If None, taken from the file extension.
+        chunk_size: Rows added per transaction.
+        resume: Continue from a checkpoint left by an interrupted import of
+                the same file, rather than starting over.
+        error_path: File for rows that failed. Defaults to
+                    ``<input_path>.errors.jsonl``.
+        background: Return a job straight away; poll job_status_tool for
+            progress and the result.
+        collection_path: Path to the collection file. If None, uses the default collection.
+
+    Returns:
+        Dict with 'success' (bool), 'path' (str), 'rows', 'added', 'failed',
+        'skipped' (rows done before resuming) and 'chunks' (int), 'seconds'
+        and 'notes_per_second' (float), 'error_path' (str, or None if no row
+        failed), or 'job' (dict) when background is true, or 'error' (str).
+    """
+    source = Path(input_path).expanduser().resolve()
+    if not source.is_file():
+        return {
+            "success": False,
+            "error": f"File {source} not found"
+        }
+    try:
+        file_format = _file_format(source, file_format)
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+    errors_file = Path(error_path).expanduser().resolve() if error_path else source.with_name(source.name + ".errors.jsonl")
+    checkpoint_file = source.with_name(source.name + ".checkpoint")
+    chunk_size = max(1, chunk_size)
+
+    manager = get_manager()
+
+    def work(path, job=None):
+        import io
+        from itertools import islice
+
+        # Check accessibility first
+        manager.check_collection_accessible(path)
+        started = time.monotonic()
+        stat = source.stat()
+        identity = {"input": str(source), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "collection": path}
+
+        state = {"rows": 0, "added": 0, "failed": 0, "chunks": 0}
+        if not resume:
+            checkpoint_file.unlink(missing_ok=True)
+        elif checkpoint_file.exists():
+            try:
+                checkpoint = json.loads(checkpoint_file.read_text())
+                saved = {key: int(checkpoint[key]) for key in state}
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(
+                    f"Checkpoint {checkpoint_file} is unreadable ({e}); pass resume=false to start over"
+                )
+            if {key: checkpoint.get(key) for key in identity} != identity:
+                raise ValueError(
+                    f"Checkpoint {checkpoint_file} is for a different file or collection; "
+                    "pass resume=false to start over"
+                )
+            state = saved
+        skipped = state["rows"]
+        if not skipped and errors_file.exists():
+            errors_file.unlink()
+
+        notetypes = {}
+        deck_ids = {}
+        raw = open(source, "rb")
+        rows = _read_rows(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""), file_format)
+        rows = islice(rows, skipped, None)
+        try:
+            while chunk := list(islice(rows, chunk_size)):
+                failures = []
+                specs = []
+                numbers = []
+                for number, row in chunk:
+                    if isinstance(row, str):
+                        failures.append((number, row, None))
+                        continue
+                    spec = _row_spec(row, field_map, note_type, deck_name)
+                    if not spec["note_type_name"]:
+                        failures.append((number, "No note type (pass note_type or add a note_type column)", row))
+                    elif not spec["deck_name"]:
+                        failures.append((number, "No deck (pass deck_name or add a deck column)", row))
+                    else:
+                        specs.append(spec)
+                        numbers.append((number, row))
+
+                def add_chunk(path):
+                    with manager.get_collection(path) as col:
+                        metadata = manager.get_metadata(col)
+                        for spec in specs:
+                            notetype = manager.find_notetype(col, spec["note_type_name"])
+                            if notetype:
+                                names = metadata['field_names'].get(notetype['id'], [])
+                                spec["fields"] = {
+                                    name: value for name, value in spec["fields"].items()
+                                    if value or name in names
+                                }
+                        requests, _, errors = _note_requests(col, specs, notetypes, deck_ids)
+                        if requests:
+                            mod = col.mod
+                            col.add_notes(requests)
+                            manager.update_duplicate_index(col, [request.note.id for request in requests], mod)
+                        return len(requests), errors
+
+                # Each chunk is its own writer call and transaction
+                added, errors = manager.submit(add_chunk, path).result()
+                failures.extend(
+                    (numbers[index][0], error, numbers[index][1]) for index, error in errors.items()
+                )
+
+                if failures:
+                    with open(errors_file, "a", encoding="utf-8") as f:
+                        for number, error, row in sorted(failures, key=lambda failure: failure[0]):
+                            f.write(json.dumps({"row": number, "error": error, "data": row}, ensure_ascii=False) + "\n")
+
+                state["rows"] += len(chunk)
+                state["added"] += added
+                state["failed"] += len(failures)
+                state["chunks"] += 1
+                # Replaced whole, so a crash can't leave it half written
+                partial = checkpoint_file.with_name(checkpoint_file.name + ".part")
+                partial.write_text(json.dumps(dict(identity, **state)))
+                partial.replace(checkpoint_file)
+                if job is not None:
+                    job['progress'] = dict(state, bytes_read=raw.tell(), bytes_total=stat.st_size)
+        finally:
+            raw.close()
+
+        checkpoint_file.unlink(missing_ok=True)
+        seconds = time.monotonic() - started
+        imported = state["rows"] - skipped
+        return {
+            "success": True,
+            "path": str(source),
+            "rows": state["rows"],
+            "added": state["added"],
+            "failed": state["failed"],
+            "skipped": skipped,
+            "chunks": state["chunks"],
+            "seconds": round(seconds, 3),
+            "notes_per_second": round(imported / seconds) if seconds > 0 else None,
+            "error_path": str(errors_file) if state["failed"] else None
+        }
+
+    try:
+        if background:
+            job = manager.start_job("import", lambda job: work(job['path'], job), collection_path, exclusive=False)
+            return {
+                "success": True,
+                "job": job
+            }
+        # work waits on the writer for each chunk, so it needs a thread of its own
+        return await asyncio.to_thread(work, manager.resolve_path(collection_path))
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+# Sync-related helper functions and tools
+
+KEYRING_SERVICE_NAME = "mousetail-anki-sync"
+
+
+# Credentials last loaded from (or saved to) the keychain
+_credentials_cache: Optional[dict] = None
+
+
+def _get_sync_endpoint_from_config() -> Optional[str]:
+    """Get the preferred sync endpoint from config.
+
+    Returns:
+        Endpoint URL string or None for AnkiWeb.
+    """
+    config = load_config()
+    return config.get("sync", {}).get("endpoint")
+
+
+async def save_sync_credentials_tool(
+    username: str,
+    password: str,
+    endpoint: Optional[str] = None
 ) -> dict:
     """Save sync credentials securely to system keychain.
 
@@ -448,8 +2441,12 @@ async def save_sync_credentials_tool(
     Returns:
         Dict with 'success' (bool), 'message' (str) or 'error' (str).
     """
+    global _credentials_cache
+    import keyring
+
     try:
         # Save username and password to keychain
+        _credentials_cache = None
         keyring.set_password(KEYRING_SERVICE_NAME, "username", username)
         keyring.set_password(KEYRING_SERVICE_NAME, username, password)
 
@@ -478,10 +2475,24 @@ async def save_sync_credentials_tool(
 async def load_sync_credentials_tool() -> dict:
     """Load saved sync credentials from system keychain.
 
+    Credentials are read from the keychain once and then served from memory
+    until they are saved or deleted through the tools.
+
     Returns:
         Dict with 'success' (bool), 'username' (str), 'password' (str),
         'endpoint' (str or None), or 'error' (str).
     """
+    return _load_saved_credentials()
+
+
+def _load_saved_credentials() -> dict:
+    """Load saved sync credentials (see load_sync_credentials_tool)."""
+    global _credentials_cache
+    if _credentials_cache is not None:
+        return dict(_credentials_cache)
+
+    import keyring
+
     try:
         # Load username
         username = keyring.get_password(KEYRING_SERVICE_NAME, "username")
@@ -502,12 +2513,13 @@ async def load_sync_credentials_tool() -> dict:
         # Load endpoint (may be None for AnkiWeb)
         endpoint = keyring.get_password(KEYRING_SERVICE_NAME, "endpoint")
 
-        return {
+        _credentials_cache = {
             "success": True,
             "username": username,
             "password": password,
             "endpoint": endpoint
         }
+        return dict(_credentials_cache)
     except Exception as e:
         return {
             "success": False,
@@ -521,7 +2533,13 @@ async def delete_sync_credentials_tool() -> dict:
     Returns:
         Dict with 'success' (bool), 'message' (str) or 'error' (str).
     """
+    global _credentials_cache
+    import keyring
+
     try:
+        _credentials_cache = None
+        get_manager().forget_sync_auth()
+
         # Get username first
         username = keyring.get_password(KEYRING_SERVICE_NAME, "username")
 
@@ -555,6 +2573,236 @@ async def delete_sync_credentials_tool() -> dict:
         }
 
 
+def _resolve_sync_credentials(
+    username: Optional[str],
+    password: Optional[str],
+    endpoint: Optional[str]
+) -> tuple[Optional[tuple], Optional[dict]]:
+    """Fill in sync credentials and endpoint from the keychain and config.
+
+    Returns:
+        ((username, password, endpoint), None), or (None, error dict) if no
+        credentials are available. An endpoint of None means AnkiWeb.
+    """
+    if not username or not password:
+        # Try to load from keychain
+        creds_result = _load_saved_credentials()
+        if not creds_result.get("success"):
+            return None, {
+                "success": False,
+                "error": "No credentials provided and no saved credentials found",
+                "required": "Please provide username and password, or use save_sync_credentials first"
+            }
+
+        username = username or creds_result.get("username")
+        password = password or creds_result.get("password")
+
+        # Use saved endpoint if not provided
+        if endpoint is None and creds_result.get("endpoint"):
+            endpoint = creds_result.get("endpoint")
+
+    # Determine endpoint to use
+    if endpoint is None:
+        # Try config.json
+        endpoint = _get_sync_endpoint_from_config()
+
+    # Convert empty string to None (for AnkiWeb)
+    if endpoint == "":
+        endpoint = None
+
+    return (username, password, endpoint), None
+
+
+def _sync_login(col, username: str, password: str, endpoint: Optional[str]) -> tuple:
+    """Log in to the sync server and remember the session for the collection.
+
+    Returns:
+        (SyncAuth, None), or (None, error dict) if login failed
+    """
+    try:
+        auth = col.sync_login(username, password, endpoint)
+    except Exception as e:
+        error_msg = str(e)
+        if "authentication" in error_msg.lower() or "invalid" in error_msg.lower():
+            return None, {
+                "success": False,
+                "error": f"Authentication failed: {error_msg}",
+                "hint": "Please check your username and password"
+            }
+        elif "network" in error_msg.lower() or "connection" in error_msg.lower():
+            return None, {
+                "success": False,
+                "error": f"Network error: {error_msg}",
+                "hint": "Please check your internet connection and endpoint URL"
+            }
+        else:
+            return None, {
+                "success": False,
+                "error": f"Login failed: {error_msg}"
+            }
+
+    get_manager().set_sync_auth(col.path, endpoint, username, auth)
+    return auth, None
+
+
+def _sync(col, username: str, password: str, endpoint: Optional[str], sync_media: bool, job: Optional[dict] = None) -> dict:
+    """Log in and sync a collection (its writer lock must be held).
+
+    The session from an earlier login is reused, so a sync normally needs no
+    login round trip; if the server rejects it, this logs in again once.
+    With sync_media, Anki carries on syncing media in the background after
+    this returns.
+
+    Args:
+        job: Background job to report the current phase on, if any.
+
+    Returns:
+        Tool result dict
+    """
+    from anki.errors import SyncError, SyncErrorKind
+
+    manager = get_manager()
+
+    # Authenticate
+    auth = manager.get_sync_auth(col.path, endpoint, username)
+    reused = auth is not None
+    if auth is None:
+        auth, error = _sync_login(col, username, password, endpoint)
+        if error is not None:
+            return error
+
+    # Perform sync
+    if job is not None:
+        job['phase'] = 'collection'
+    try:
+        try:
+            output = col.sync_collection(auth, sync_media=sync_media)
+        except SyncError as e:
+            if not reused or e.kind != SyncErrorKind.AUTH:
+                raise
+            # The saved session was rejected (e.g. password changed)
+            manager.forget_sync_auth(col.path)
+            auth, error = _sync_login(col, username, password, endpoint)
+            if error is not None:
+                return error
+            output = col.sync_collection(auth, sync_media=sync_media)
+
+        # AnkiWeb may move the account to another server
+        if output.new_endpoint:
+            auth.endpoint = output.new_endpoint
+
+        # Parse sync output
+        endpoint_str = f" with {endpoint}" if endpoint else " with AnkiWeb"
+        media_str = " (including media)" if sync_media else " (collection only)"
+
+        return {
+            "success": True,
+            "message": f"Collection synced successfully{endpoint_str}{media_str}",
+            "output": str(output),
+            "full_sync_required": output.required in (
+                output.FULL_SYNC, output.FULL_DOWNLOAD, output.FULL_UPLOAD
+            )
+        }
+    except Exception as e:
+        error_msg = str(e)
+        return {
+            "success": False,
+            "error": f"Sync failed: {error_msg}",
+            "hint": "Check for conflicts or try syncing from Anki desktop first"
+        }
+
+
+def _progress_text(text: str) -> str:
+    """Strip the Unicode isolation marks Anki puts around numbers in progress text."""
+    return text.replace("\u2068", "").replace("\u2069", "")
+
+
+def _sync_progress(col) -> dict:
+    """Read Anki's progress for the sync in flight.
+
+    Returns:
+        Dict with the collection sync 'stage' and 'added'/'removed' counts,
+        'bytes_transferred'/'bytes_total' during a full sync, or the
+        'media_checked'/'media_added'/'media_removed' counts during a media
+        sync. Empty when nothing is reported.
+    """
+    progress = col.latest_progress()
+    which = progress.WhichOneof('value')
+    if which == 'normal_sync':
+        return {
+            "stage": _progress_text(progress.normal_sync.stage),
+            "added": _progress_text(progress.normal_sync.added),
+            "removed": _progress_text(progress.normal_sync.removed),
+        }
+    if which == 'full_sync':
+        return {
+            "bytes_transferred": progress.full_sync.transferred,
+            "bytes_total": progress.full_sync.total,
+        }
+    if which == 'media_sync':
+        return _media_progress(progress.media_sync)
+    return {}
+
+
+def _media_progress(media) -> dict:
+    """Convert Anki's media sync progress to a dict."""
+    return {
+        "media_checked": _progress_text(media.checked),
+        "media_added": _progress_text(media.added),
+        "media_removed": _progress_text(media.removed),
+    }
+
+
+SYNC_POLL_INTERVAL = 0.5
+
+
+def _start_sync_job(credentials: tuple, sync_media: bool, collection_path: Optional[str] = None) -> dict:
+    """Start a background sync job (see start_sync_tool).
+
+    Args:
+        credentials: (username, password, endpoint) from _resolve_sync_credentials.
+        sync_media: Include media files in the sync.
+        collection_path: Path to collection file, or None for the default.
+
+    Returns:
+        The job dict, or the already running sync job for the collection
+    """
+    manager = get_manager()
+
+    def sync_work(path, job):
+        job['phase'] = 'login'
+        # The sync's own changes mustn't look like edits that need syncing
+        with manager.get_collection(path, track_changes=False) as col:
+            return _sync(col, *credentials, sync_media, job=job)
+
+    def run_job(job):
+        path = job['path']
+        manager.check_collection_accessible(path)
+
+        # The collection sync runs on the writer thread, in turn with writes
+        future = manager.submit(lambda p: sync_work(p, job), path)
+        while not future.done():
+            time.sleep(SYNC_POLL_INTERVAL)
+            if job['phase'] == 'collection':
+                with manager.get_collection(path, read_only=True) as col:
+                    job['progress'] = _sync_progress(col)
+        result = future.result()
+
+        # Anki syncs media in the background; follow it until it's done
+        if result.get("success") and sync_media:
+            job['phase'] = 'media'
+            while True:
+                with manager.get_collection(path, read_only=True) as col:
+                    status = col.media_sync_status()
+                job['progress'] = _media_progress(status.progress)
+                if not status.active:
+                    break
+                time.sleep(SYNC_POLL_INTERVAL)
+        return result
+
+    return manager.start_job("sync", run_job, collection_path)
+
+
 async def sync_collection_tool(
     username: Optional[str] = None,
     password: Optional[str] = None,
@@ -566,7 +2814,9 @@ async def sync_collection_tool(
 
     This tool uploads local changes and downloads remote changes to keep your
     collection in sync. By default, it syncs both the collection data (cards,
-    notes, decks) and media files (images, audio).
+    notes, decks) and media files (images, audio). It returns once the
+    collection itself is synced; use start_sync to sync in the background and
+    follow media progress.
 
     Authentication priority:
     1. Credentials passed as parameters
@@ -589,88 +2839,119 @@ async def sync_collection_tool(
         collection_path: Path to collection file (optional, uses default if not provided).
 
     Returns:
-        Dict with 'success' (bool), 'message' (str), 'required' (str) or 'error' (str).
+        Dict with 'success' (bool), 'message' (str), 'output' (str),
+        'full_sync_required' (bool: nothing was synced because Anki needs a
+        one-way full sync, which has to be done from Anki itself),
+        'required' (str) or 'error' (str).
     """
     manager = get_manager()
 
     try:
-        # Determine credentials to use
-        if not username or not password:
-            # Try to load from keychain
-            creds_result = await load_sync_credentials_tool()
-            if not creds_result.get("success"):
-                return {
-                    "success": False,
-                    "error": "No credentials provided and no saved credentials found",
-                    "required": "Please provide username and password, or use save_sync_credentials first"
-                }
+        credentials, error = _resolve_sync_credentials(username, password, endpoint)
+        if error is not None:
+            return error
 
-            username = username or creds_result.get("username")
-            password = password or creds_result.get("password")
+        def work(path):
+            # Check collection accessibility
+            manager.check_collection_accessible(path)
 
-            # Use saved endpoint if not provided
-            if endpoint is None and creds_result.get("endpoint"):
-                endpoint = creds_result.get("endpoint")
+            with manager.get_collection(path, track_changes=False) as col:
+                return _sync(col, *credentials, sync_media)
 
-        # Determine endpoint to use
-        if endpoint is None:
-            # Try config.json
-            endpoint = _get_sync_endpoint_from_config()
+        return await manager.run(work, collection_path)
 
-        # Convert empty string to None (for AnkiWeb)
-        if endpoint == "":
-            endpoint = None
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
 
-        # Check collection accessibility
-        manager.check_collection_accessible(collection_path)
 
-        with manager.get_collection(collection_path) as col:
-            # Authenticate
-            try:
-                auth = col.sync_login(username, password, endpoint)
-            except Exception as e:
-                error_msg = str(e)
-                if "authentication" in error_msg.lower() or "invalid" in error_msg.lower():
-                    return {
-                        "success": False,
-                        "error": f"Authentication failed: {error_msg}",
-                        "hint": "Please check your username and password"
-                    }
-                elif "network" in error_msg.lower() or "connection" in error_msg.lower():
-                    return {
-                        "success": False,
-                        "error": f"Network error: {error_msg}",
-                        "hint": "Please check your internet connection and endpoint URL"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Login failed: {error_msg}"
-                    }
+async def start_sync_tool(
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    sync_media: bool = True,
+    collection_path: Optional[str] = None
+) -> dict:
+    """Start syncing a collection in the background.
 
-            # Perform sync
-            try:
-                output = col.sync_collection(auth, sync_media=sync_media)
+    Takes the same arguments, credentials and endpoint rules as
+    sync_collection_tool but returns a job ID straight away. Poll
+    sync_status_tool for progress and the result. The sync queues behind
+    (and blocks) writes to the collection while the collection itself
+    syncs; read-only tools keep working, and media sync doesn't block
+    anything. Only one sync runs per collection: starting another while
+    one is running returns the running job.
 
-                # Parse sync output
-                endpoint_str = f" with {endpoint}" if endpoint else " with AnkiWeb"
-                media_str = " (including media)" if sync_media else " (collection only)"
+    Args:
+        username: AnkiWeb ID or sync server username (optional if saved).
+        password: Account password (optional if saved).
+        endpoint: Sync server URL (optional, AnkiWeb if not provided).
+        sync_media: Include media files in sync (default: True).
+        collection_path: Path to collection file (optional, uses default if not provided).
 
-                return {
-                    "success": True,
-                    "message": f"Collection synced successfully{endpoint_str}{media_str}",
-                    "output": str(output)
-                }
-            except Exception as e:
-                error_msg = str(e)
-                return {
-                    "success": False,
-                    "error": f"Sync failed: {error_msg}",
-                    "hint": "Check for conflicts or try syncing from Anki desktop first"
-                }
+    Returns:
+        Dict with 'success' (bool) and 'job' (job dict with 'id', 'status'
+        and 'phase'), or 'error' (str).
+    """
+    try:
+        credentials, error = _resolve_sync_credentials(username, password, endpoint)
+        if error is not None:
+            return error
+
+        job = _start_sync_job(credentials, sync_media, collection_path)
+        return {
+            "success": True,
+            "job": job
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+async def sync_status_tool(job_id: Optional[str] = None, collection_path: Optional[str] = None) -> dict:
+    """Report the progress or result of background syncs.
 
+    Args:
+        job_id: Job ID returned by start_sync_tool. If None, reports the
+            recent sync jobs (for collection_path, if given).
+        collection_path: Path to collection file (optional).
+
+    Returns:
+        Dict with 'success' (bool) and 'job' (dict) or 'jobs' (list of dicts),
+        or 'error' (str). A job has 'id', 'status' (running, succeeded or
+        failed), 'phase' (queued, login, collection, media or done), 'progress'
+        (stage and added/removed counts, bytes for full syncs, media file
+        counts), 'result' (the sync result, as sync_collection_tool returns
+        it) and 'error'.
+    """
+    manager = get_manager()
+
+    if job_id is not None:
+        job = manager.get_job(job_id)
+        if job is None or job['kind'] != "sync":
+            return {
+                "success": False,
+                "error": f"Sync job {job_id} not found"
+            }
+        return {
+            "success": True,
+            "job": job
+        }
+
+    try:
+        path = manager.resolve_path(collection_path) if collection_path else None
     except Exception as e:
         return {
             "success": False,
             "error": str(e)
         }
+    jobs = [job for job in manager.list_jobs("sync") if path is None or job['path'] == path]
+    return {
+        "success": True,
+        "jobs": jobs
+    }
@@ -1,32 +1,262 @@
 """Collection Manager for Anki MCP Server.
 
 Handles opening, closing, and managing Anki collection instances.
-Supports multiple collections and thread-safe access.
+Supports multiple collections and thread-safe access. Each collection has a
+dedicated worker thread so blocking Anki calls never run on the asyncio
+event loop.
 """
 
+import asyncio
+import copy
+import html
+import logging
 import os
+import re
+import sqlite3
 import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from contextlib import contextmanager
 
-from anki.collection import Collection
 from anki.errors import AnkiError
 
+from mousetail.server.fulltext import SIDECAR_SUFFIX, FulltextIndex
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime: anki.collection loads the Rust backend
+    from anki.collection import Collection
+
+
+logger = logging.getLogger(__name__)
+
+# Number of distinct searches remembered per collection
+SEARCH_CACHE_SIZE = 16
+
+# Collection states reported by CollectionManager.collection_state
+STATE_OPEN = "open"
+STATE_AVAILABLE = "available"
+STATE_LOCKED = "locked"
+STATE_MISSING = "missing"
+
+# Seconds a cached collection state is trusted even if no file changed
+STATE_CACHE_TTL = 5.0
+
+# Threads per collection for read-only tool calls (0 runs reads on the writer)
+READ_WORKERS = 4
+
+# Background job states, and how many finished jobs are remembered
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_HISTORY_SIZE = 32
+
+# Collections kept open at once; the least recently used idle one is closed
+# to make room for another
+MAX_OPEN_COLLECTIONS = 4
+
+# Notes read per query while building a duplicate index
+DUPLICATE_INDEX_PAGE = 20000
+
+_HTML_TAG = re.compile(r"<[^>]*>")
+
+# The first field of a note, without reading the others into Python
+_FIRST_FIELD = "substr(flds, 1, instr(flds || char(31), char(31)) - 1)"
+
+
+def _file_signature(path: str) -> Optional[tuple]:
+    """Get a cheap change signature for a collection and its SQLite side files.
+
+    Opening a collection creates or touches its WAL, shared-memory or
+    journal file, which changes the signature.
+
+    Returns:
+        Tuple of (size, mtime) pairs, or None if the collection doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    signature = [(stat.st_size, stat.st_mtime_ns)]
+    for suffix in ("-wal", "-shm", "-journal"):
+        try:
+            side = os.stat(path + suffix)
+            signature.append((side.st_size, side.st_mtime_ns))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Get the process's resident memory, or None if the platform won't say."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _open_files() -> Optional[list[str]]:
+    """List the files this process has open, or None if unsupported (non-Linux)."""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    files = []
+    for fd in fds:
+        try:
+            files.append(os.readlink(f"/proc/self/fd/{fd}"))
+        except OSError:
+            pass
+    return files
+
+
+def _is_locked(path: str) -> bool:
+    """Check whether another process holds the collection's SQLite lock.
+
+    Uses a read-only SQLite connection with no busy timeout instead of
+    opening the collection through Anki.
+    """
+    uri = Path(path).as_uri() + "?mode=ro"
+    try:
+        conn = sqlite3.connect(uri, uri=True, timeout=0)
+    except sqlite3.Error:
+        return False
+    try:
+        conn.execute("select 1 from col limit 1").fetchall()
+    except sqlite3.OperationalError as e:
+        message = str(e).lower()
+        return "locked" in message or "busy" in message
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+    return False
+
+
+def duplicate_key(mid: int, first_field: str) -> int:
+    """Get the duplicate-detection key of a note.
+
+    Notes of the same note type whose first fields match once HTML, case
+    and runs of whitespace are ignored get the same key. Keys are Python
+    hashes, so they are only comparable within one process.
+
+    Args:
+        mid: Note type ID.
+        first_field: Raw value of the note's first field.
+
+    Returns:
+        The key, as an int
+    """
+    text = first_field
+    if "<" in text:
+        text = _HTML_TAG.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return hash((mid, " ".join(text.split()).casefold()))
+
+
+class _SharedLock:
+    """Lock that any number of readers can hold at once, or one holder exclusively.
+
+    A pending exclusive acquire stops new readers from entering, so a stream
+    of reads can't hold it off indefinitely.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._exclusive = False
+        self._waiting = 0
+
+    @contextmanager
+    def shared(self):
+        with self._cond:
+            while self._exclusive or self._waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._cond:
+            self._waiting += 1
+            while self._exclusive or self._readers:
+                self._cond.wait()
+            self._waiting -= 1
+            self._exclusive = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._exclusive = False
+                self._cond.notify_all()
+
 
 class CollectionManager:
-    """Manages Anki collection lifecycle and access."""
+    """Manages Anki collection lifecycle and access.
+
+    Each collection has one writer thread, on which tool calls that modify it
+    run one at a time, and a small pool of reader threads for read-only calls.
+    Anki keeps its database in exclusive locking mode, so readers can't have a
+    connection of their own; instead they share the collection without taking
+    the writer lock, and Anki's backend serializes individual database calls.
+    A read therefore waits for at most the backend call in progress, not for
+    every queued write. Set ``read_workers`` to 0 to serialize everything.
+    """
 
     def __init__(self):
-        self._collections: dict[str, Collection] = {}
+        self._collections: dict[str, 'Collection'] = {}
         self._locks: dict[str, threading.RLock] = {}
+        self._gates: dict[str, _SharedLock] = {}
         self._global_lock = threading.RLock()
+        self._opening: dict[str, threading.Lock] = {}
+        self._search_cache: dict[str, OrderedDict] = {}
+        self._metadata: dict[str, dict] = {}
+        self._tag_counts: dict[str, tuple[int, dict]] = {}
+        self._duplicates: dict[str, dict] = {}
+        self._duplicates_lock = threading.Lock()
+        self._fulltext: dict[str, FulltextIndex] = {}
+        self._workers: dict[str, ThreadPoolExecutor] = {}
+        self._readers: dict[str, ThreadPoolExecutor] = {}
+        self.read_workers = READ_WORKERS
+        self.max_open = MAX_OPEN_COLLECTIONS
+        self.idle_close: Optional[float] = None
+        self._in_use: dict[str, int] = {}
+        self._last_used: dict[str, float] = {}
+        self._opened_at: dict[str, float] = {}
+        self._janitor: Optional[threading.Thread] = None
+        self._jobs: dict[str, dict] = {}
+        self._sync_auth: dict[tuple, object] = {}
+        self._write_listeners: list = []
+        self._worker_stats: dict[str, dict] = {}
+        self._states: dict[str, tuple] = {}
+        self._base_path = None
+        self._discovery: Optional[tuple] = None
+        self._counts: dict[str, tuple[int, int]] = {}
+        self.timings: dict = {'open_ms': {}}
+
+    def _get_anki_base_path(self) -> Optional[Path]:
+        """Get the Anki2 data directory for the current platform.
+
+        The result is computed once and cached.
+        """
+        if self._base_path is not None:
+            return self._base_path or None
 
-    def _get_default_collection_path(self) -> Optional[str]:
-        """Get the default Anki collection path for the current platform."""
         home = Path.home()
 
-        # Platform-specific default paths
+        # Platform-specific base paths
         if os.name == 'nt':  # Windows
             base_path = home / "AppData" / "Roaming" / "Anki2"
         elif os.name == 'posix':
@@ -35,58 +265,96 @@ class CollectionManager:
             else:  # Linux
                 base_path = home / ".local" / "share" / "Anki2"
         else:
-            return None
+            base_path = None
 
-        # Look for User 1 profile (default)
-        default_profile = base_path / "User 1" / "collection.anki2"
-        if default_profile.exists():
-            return str(default_profile)
+        # Empty string marks "no base path" so it isn't recomputed
+        self._base_path = base_path or ""
+        return base_path
 
-        # Try to find any collection
-        if base_path.exists():
-            for profile_dir in base_path.iterdir():
-                if profile_dir.is_dir():
-                    collection_file = profile_dir / "collection.anki2"
-                    if collection_file.exists():
-                        return str(collection_file)
+    def _get_profiles(self) -> list[tuple[str, str]]:
+        """Get (profile name, collection path) pairs from the discovery index.
+
+        The Anki2 directory is only rescanned when its modification time
+        changes, i.e. when a profile directory is added, removed or renamed.
+        """
+        base_path = self._get_anki_base_path()
+        if base_path is None:
+            return []
+
+        try:
+            mtime = base_path.stat().st_mtime_ns
+        except OSError:
+            return []
+
+        with self._global_lock:
+            if self._discovery is not None and self._discovery[0] == mtime:
+                return self._discovery[1]
+
+        profiles = []
+        for profile_dir in base_path.iterdir():
+            if profile_dir.is_dir():
+                profiles.append((profile_dir.name, str((profile_dir / "collection.anki2").resolve())))
+
+        # Keep the default profile first
+        profiles.sort(key=lambda profile: profile[0] != "User 1")
+
+        with self._global_lock:
+            self._discovery = (mtime, profiles)
+        return profiles
+
+    def _record_counts(self, path: str, col: 'Collection'):
+        """Remember a collection's note and card counts for list_available_collections."""
+        counts = (col.note_count(), col.card_count())
+        with self._global_lock:
+            self._counts[path] = counts
+
+    def _get_default_collection_path(self) -> Optional[str]:
+        """Get the default Anki collection path for the current platform."""
+        # The "User 1" profile (default) sorts first
+        for _, path in self._get_profiles():
+            if os.path.exists(path):
+                return path
 
         return None
 
-    def list_available_collections(self) -> list[dict[str, str]]:
+    def list_available_collections(self) -> list[dict]:
         """List all available Anki collections on the system.
 
+        Uses the discovery index and file metadata only; no collection is
+        opened. Note and card counts are the last values seen while the
+        collection was open in this process, or None if it hasn't been.
+
         Returns:
-            List of dicts with 'profile' and 'path' keys
+            List of dicts with 'profile', 'path', 'size' (bytes), 'modified'
+            (timestamp), 'note_count' and 'card_count' keys
         """
         collections = []
-        home = Path.home()
+        for profile, path in self._get_profiles():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
 
-        # Platform-specific base paths
-        if os.name == 'nt':  # Windows
-            base_path = home / "AppData" / "Roaming" / "Anki2"
-        elif os.name == 'posix':
-            if os.uname().sysname == 'Darwin':  # macOS
-                base_path = home / "Library" / "Application Support" / "Anki2"
-            else:  # Linux
-                base_path = home / ".local" / "share" / "Anki2"
-        else:
-            return collections
-
-        if base_path.exists():
-            for profile_dir in base_path.iterdir():
-                if profile_dir.is_dir():
-                    collection_file = profile_dir / "collection.anki2"
-                    if collection_file.exists():
-                        collections.append({
-                            'profile': profile_dir.name,
-                            'path': str(collection_file)
-                        })
+            with self._global_lock:
+                note_count, card_count = self._counts.get(path, (None, None))
+
+            collections.append({
+                'profile': profile,
+                'path': path,
+                'size': stat.st_size,
+                'modified': stat.st_mtime,
+                'note_count': note_count,
+                'card_count': card_count,
+            })
 
         return collections
 
     def check_collection_accessible(self, path: Optional[str] = None) -> str:
         """Check if a collection is accessible (not locked by Anki app).
 
+        Uses the cached state from collection_state, so the collection is
+        never opened just to check for a lock.
+
         Args:
             path: Path to collection file. If None, uses default.
 
@@ -104,28 +372,51 @@ class CollectionManager:
 
         path = str(Path(path).resolve())
 
-        if not os.path.exists(path):
+        state = self.collection_state(path)
+        if state == STATE_MISSING:
             raise ValueError(f"Collection file does not exist: {path}")
+        if state == STATE_LOCKED:
+            raise AnkiError(
+                "Cannot access Anki database: The Anki application is currently running. "
+                "Please close Anki completely and try again."
+            )
+
+        return path
+
+    def collection_state(self, path: str) -> str:
+        """Get the state of a collection without opening it.
+
+        The result is cached and recomputed when the collection file or one
+        of its SQLite side files changes, or after STATE_CACHE_TTL seconds.
+        A cached check costs a few stat calls; a fresh one is a read-only
+        SQLite lock probe, never a full Anki open.
 
-        # If already open in this session, it's accessible
+        Args:
+            path: Resolved path to collection file
+
+        Returns:
+            One of STATE_OPEN, STATE_AVAILABLE, STATE_LOCKED or STATE_MISSING
+        """
         with self._global_lock:
             if path in self._collections:
-                return path
+                return STATE_OPEN
 
-        # Try to open and immediately close to check for locks
-        try:
-            test_col = Collection(path)
-            test_col.close()
-        except Exception as e:
-            error_msg = str(e).lower()
-            if "already open" in error_msg or "syncing" in error_msg or "locked" in error_msg:
-                raise AnkiError(
-                    "Cannot access Anki database: The Anki application is currently running. "
-                    "Please close Anki completely and try again."
-                )
-            raise AnkiError(f"Failed to access collection: {e}")
+        signature = _file_signature(path)
+        if signature is None:
+            with self._global_lock:
+                self._states.pop(path, None)
+            return STATE_MISSING
 
-        return path
+        now = time.monotonic()
+        with self._global_lock:
+            cached = self._states.get(path)
+        if cached is not None and cached[0] == signature and now - cached[2] < STATE_CACHE_TTL:
+            return cached[1]
+
+        state = STATE_LOCKED if _is_locked(path) else STATE_AVAILABLE
+        with self._global_lock:
+            self._states[path] = (signature, state, now)
+        return state
 
     def open_collection(self, path: Optional[str] = None) -> str:
         """Open a collection and return its path identifier.
@@ -150,50 +441,475 @@ class CollectionManager:
         if not os.path.exists(path):
             raise ValueError(f"Collection file does not exist: {path}")
 
+        self._make_room(path)
+
         with self._global_lock:
-            if path not in self._collections:
+            opening = self._opening.setdefault(path, threading.Lock())
+
+        # Only opens of the same path wait for each other: the global lock
+        # isn't held while anki loads and the collection opens, so calls for
+        # other collections (and the event loop submitting them) go on
+        with opening:
+            with self._global_lock:
+                already_open = path in self._collections
+            if not already_open:
                 try:
+                    started = time.perf_counter()
+                    # Deferred so the server can start before anki is loaded
+                    from anki.collection import Collection
+                    imported = time.perf_counter()
                     col = Collection(path)
-                    self._collections[path] = col
-                    self._locks[path] = threading.RLock()
+                    opened = time.perf_counter()
+                    self._record_counts(path, col)
                 except Exception as e:
                     error_msg = str(e).lower()
                     if "already open" in error_msg or "syncing" in error_msg or "locked" in error_msg:
+                        signature = _file_signature(path)
+                        if signature is not None:
+                            with self._global_lock:
+                                self._states[path] = (signature, STATE_LOCKED, time.monotonic())
                         raise AnkiError(
                             "Cannot access Anki database: The Anki application is currently running. "
                             "Please close Anki completely and try again."
                         )
                     raise AnkiError(f"Failed to open collection: {e}")
 
+                with self._global_lock:
+                    self._collections[path] = col
+                    self._locks[path] = threading.RLock()
+                    self._gates[path] = _SharedLock()
+                    self._opened_at[path] = self._last_used[path] = time.monotonic()
+                    self.timings.setdefault('anki_import_ms', round((imported - started) * 1000, 1))
+                    self.timings['open_ms'][path] = round((opened - imported) * 1000, 1)
+                logger.info(
+                    f"Opened collection {path} in {self.timings['open_ms'][path]} ms "
+                    f"(anki import {round((imported - started) * 1000, 1)} ms)"
+                )
+
+        self._start_janitor()
         return path
 
-    def close_collection(self, path: str):
+    def _make_room(self, path: str):
+        """Close least recently used idle collections so path can be opened.
+
+        Collections in use (held, or with calls queued for them) are never
+        closed, so the limit can be exceeded while all of them are busy.
+        """
+        with self._global_lock:
+            if path in self._collections or not self.max_open:
+                return
+            excess = len(self._collections) - self.max_open + 1
+            if excess <= 0:
+                return
+            idle = [p for p in self._collections if not self._in_use.get(p)]
+            victims = sorted(idle, key=lambda p: self._last_used.get(p, 0.0))[:excess]
+
+        for victim in victims:
+            logger.info(f"Closing least recently used collection {victim}")
+            self.close_collection(victim, if_idle=True)
+        if len(victims) < excess:
+            logger.warning(
+                f"Opening {path} with {len(self._collections)} collections open: "
+                f"the others are all in use"
+            )
+
+    def _start_janitor(self):
+        """Start the idle-close thread if idle_close is set and it isn't running."""
+        with self._global_lock:
+            if self._janitor is not None or not self.idle_close:
+                return
+            self._janitor = threading.Thread(
+                target=self._close_idle_loop, name="mousetail-idle", daemon=True
+            )
+            self._janitor.start()
+
+    def _close_idle_loop(self):
+        """Periodically close idle collections until idle_close is unset."""
+        while self.idle_close:
+            time.sleep(max(1.0, min(self.idle_close / 2, 30.0)))
+            try:
+                self.close_idle()
+            except Exception as e:
+                logger.warning(f"Closing idle collections failed: {e}")
+        with self._global_lock:
+            self._janitor = None
+
+    def close_idle(self) -> list[str]:
+        """Close collections that have been unused for idle_close seconds.
+
+        Returns:
+            Paths of the collections that were closed
+        """
+        if not self.idle_close:
+            return []
+        now = time.monotonic()
+        with self._global_lock:
+            idle = [
+                p for p in self._collections
+                if not self._in_use.get(p) and now - self._last_used.get(p, now) >= self.idle_close
+            ]
+        closed = []
+        for path in idle:
+            if self.close_collection(path, if_idle=True):
+                logger.info(f"Closed collection {path} after {self.idle_close} s idle")
+                closed.append(path)
+        return closed
+
+    def _use(self, path: str):
+        """Mark a collection as in use (until the matching _release)."""
+        with self._global_lock:
+            self._in_use[path] = self._in_use.get(path, 0) + 1
+            self._last_used[path] = time.monotonic()
+
+    def _release(self, path: str):
+        """Undo one _use of a collection."""
+        with self._global_lock:
+            self._in_use[path] -= 1
+            if not self._in_use[path]:
+                del self._in_use[path]
+            self._last_used[path] = time.monotonic()
+
+    def close_collection(self, path: str, if_idle: bool = False) -> bool:
         """Close a collection.
 
+        Waits for the writer lock and for any readers to finish first.
+
         Args:
             path: Path to collection file
+            if_idle: Leave the collection open if it's in use or has calls
+                queued for it by then.
+
+        Returns:
+            False if the collection was left open because it was in use
         """
         with self._global_lock:
-            if path in self._collections:
-                col = self._collections[path]
-                with self._locks[path]:
+            col = self._collections.get(path)
+            lock = self._locks.get(path)
+            gate = self._gates.get(path)
+
+        if col is not None:
+            # The global lock must not be held while waiting here: tool calls
+            # holding the collection take it to update caches and stats.
+            # Writer lock first, since a writer may take a read lock inside.
+            with lock, gate.exclusive():
+                if if_idle and self._in_use.get(path):
+                    return False
+                if self._collections.get(path) is col:
+                    self._record_counts(path, col)
                     col.close()
-                del self._collections[path]
-                del self._locks[path]
+                    with self._global_lock:
+                        del self._collections[path]
+                        del self._locks[path]
+                        del self._gates[path]
+                        self._opened_at.pop(path, None)
+                        self._search_cache.pop(path, None)
+                        self._metadata.pop(path, None)
+                        self._tag_counts.pop(path, None)
+                        self._duplicates.pop(path, None)
+                        fulltext = self._fulltext.pop(path, None)
+                    if fulltext is not None:
+                        fulltext.close()
+
+        with self._global_lock:
+            # Calls queued meanwhile (submit marks them in use before getting
+            # a worker) keep the workers; they reopen the collection
+            if self._in_use.get(path):
+                return True
+            executors = [self._workers.pop(path, None), self._readers.pop(path, None)]
+            self._worker_stats.pop(path, None)
+        for executor in executors:
+            if executor is not None:
+                # Don't wait: this may be running on the executor itself
+                executor.shutdown(wait=False)
+        return True
+
+    def prewarm(self, path: Optional[str] = None):
+        """Open a collection and load its metadata in the background.
+
+        The work is queued on the collection's worker thread, so a tool call
+        arriving meanwhile simply waits for the open instead of racing it.
+        Failures (e.g. Anki is running) are logged and otherwise ignored.
+
+        Args:
+            path: Path to collection. If None, uses the default.
+
+        Returns:
+            Future for the background open, or None if no collection was found
+        """
+        try:
+            path = self.resolve_path(path)
+        except ValueError as e:
+            logger.warning(f"Not prewarming: {e}")
+            return None
+
+        def warm():
+            try:
+                self.check_collection_accessible(path)
+                with self.get_collection(path) as col:
+                    self.get_metadata(col)
+            except Exception as e:
+                logger.warning(f"Prewarming {path} failed: {e}")
+
+        worker, _ = self._get_worker(path)
+        return worker.submit(warm)
 
     def close_all(self):
         """Close all open collections."""
         with self._global_lock:
             paths = list(self._collections.keys())
-            for path in paths:
-                self.close_collection(path)
+        for path in paths:
+            self.close_collection(path)
+        with self._global_lock:
+            executors = list(self._workers.values()) + list(self._readers.values())
+            self._workers.clear()
+            self._readers.clear()
+            self._worker_stats.clear()
+        for executor in executors:
+            executor.shutdown(wait=False)
+
+    def resolve_path(self, path: Optional[str] = None) -> str:
+        """Resolve a collection path the same way get_collection does.
+
+        Args:
+            path: Path to collection. If None, uses the first open collection or the default.
+
+        Returns:
+            Absolute collection path
+
+        Raises:
+            ValueError: If path is None and no default collection exists
+        """
+        if path is None:
+            with self._global_lock:
+                if self._collections:
+                    return next(iter(self._collections.keys()))
+            path = self._get_default_collection_path()
+            if path is None:
+                raise ValueError("No default collection found. Please specify a path.")
+
+        return str(Path(path).resolve())
+
+    def _get_worker(self, path: str) -> tuple[ThreadPoolExecutor, dict]:
+        """Get (creating if needed) the worker thread and stats for a collection."""
+        with self._global_lock:
+            worker = self._workers.get(path)
+            if worker is None:
+                worker = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix=f"mousetail-{Path(path).parent.name}"
+                )
+                self._workers[path] = worker
+                self._worker_stats[path] = {
+                    'calls': 0,
+                    'queue_depth': 0,
+                    'queue_wait_total': 0.0,
+                    'queue_wait_max': 0.0,
+                    'lock_wait_total': 0.0,
+                    'lock_wait_max': 0.0,
+                }
+            return worker, self._worker_stats[path]
+
+    def _get_reader(self, path: str) -> ThreadPoolExecutor:
+        """Get (creating if needed) the reader thread pool for a collection."""
+        with self._global_lock:
+            reader = self._readers.get(path)
+            if reader is None:
+                reader = ThreadPoolExecutor(
+                    max_workers=self.read_workers,
+                    thread_name_prefix=f"mousetail-read-{Path(path).parent.name}"
+                )
+                self._readers[path] = reader
+            return reader
+
+    async def run(self, func, path: Optional[str] = None, read_only: bool = False):
+        """Run a blocking function on one of the collection's worker threads.
+
+        Calls that may modify the collection are executed one at a time in
+        submission order on its writer thread. Read-only calls go to the
+        reader pool instead (unless read_workers is 0), where they run in
+        parallel with each other and with the writer. Either way the event
+        loop stays free while they run.
+
+        Args:
+            func: Callable taking the resolved collection path.
+            path: Path to collection. If None, uses the first open collection or the default.
+            read_only: func only reads, and opens the collection with
+                ``get_collection(path, read_only=True)``.
+
+        Returns:
+            Whatever func returns
+
+        Example:
+            >>> def count(path):
+            ...     with manager.get_collection(path) as col:
+            ...         return col.note_count()
+            >>> await manager.run(count)
+        """
+        return await asyncio.wrap_future(self.submit(func, path, read_only))
+
+    def submit(self, func, path: Optional[str] = None, read_only: bool = False) -> Future:
+        """Queue a blocking function on the collection's workers, like run().
+
+        For callers that aren't on the event loop, such as background jobs.
+
+        Returns:
+            concurrent.futures.Future for func's result
+        """
+        path = self.resolve_path(path)
+        # Keeps the collection from being evicted, and its workers from being
+        # shut down, while the call is queued
+        self._use(path)
+        try:
+            worker, stats = self._get_worker(path)
+            if read_only and self.read_workers:
+                worker = self._get_reader(path)
+            submitted = time.perf_counter()
+
+            def call():
+                waited = time.perf_counter() - submitted
+                with self._global_lock:
+                    stats['calls'] += 1
+                    stats['queue_depth'] -= 1
+                    stats['queue_wait_total'] += waited
+                    stats['queue_wait_max'] = max(stats['queue_wait_max'], waited)
+                return func(path)
+
+            with self._global_lock:
+                stats['queue_depth'] += 1
+            try:
+                future = worker.submit(call)
+            except BaseException:
+                with self._global_lock:
+                    stats['queue_depth'] -= 1
+                raise
+        except BaseException:
+            self._release(path)
+            raise
+
+        future.add_done_callback(lambda _: self._release(path))
+        return future
+
+    def start_job(self, kind: str, func, path: Optional[str] = None, exclusive: bool = True) -> dict:
+        """Run a long operation on a collection in the background.
+
+        func runs on its own thread and receives the job dict, which it may
+        update (e.g. 'phase' and 'progress') for get_job to report. What it
+        returns becomes the job's 'result'; an exception marks the job
+        failed. The collection isn't evicted while the job runs. Unless
+        exclusive is False, only one job of a kind runs per collection:
+        starting another returns the running one.
+
+        Args:
+            kind: Job type, e.g. "sync".
+            func: Callable taking the job dict.
+            path: Path to collection. If None, uses the first open collection or the default.
+            exclusive: Return the running job of this kind, if any, instead
+                of starting another.
+
+        Returns:
+            The job dict (a snapshot; poll get_job for updates)
+        """
+        path = self.resolve_path(path)
+        with self._global_lock:
+            for job in self._jobs.values() if exclusive else ():
+                if job['kind'] == kind and job['path'] == path and job['status'] == JOB_RUNNING:
+                    return dict(job, already_running=True)
+
+            job = {
+                'id': uuid.uuid4().hex[:12],
+                'kind': kind,
+                'path': path,
+                'status': JOB_RUNNING,
+                'phase': 'queued',
+                'progress': {},
+                'result': None,
+                'error': None,
+                'started': time.time(),
+                'finished': None,
+            }
+            self._jobs[job['id']] = job
+            while len(self._jobs) > JOB_HISTORY_SIZE:
+                oldest = next(
+                    (jid for jid, j in self._jobs.items() if j['status'] != JOB_RUNNING), None
+                )
+                if oldest is None:
+                    break
+                del self._jobs[oldest]
+            snapshot = dict(job)
+
+        self._use(path)
+
+        def target():
+            try:
+                result = func(job)
+                with self._global_lock:
+                    job['result'] = result
+                    job['status'] = JOB_SUCCEEDED
+            except Exception as e:
+                logger.warning(f"{kind} job {job['id']} failed: {e}")
+                with self._global_lock:
+                    job['error'] = str(e)
+                    job['status'] = JOB_FAILED
+            finally:
+                with self._global_lock:
+                    job['phase'] = 'done'
+                    job['finished'] = time.time()
+                self._release(path)
+
+        threading.Thread(target=target, name=f"mousetail-{kind}-{job['id']}", daemon=True).start()
+        return snapshot
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """Get a snapshot of a background job, or None if it is unknown."""
+        with self._global_lock:
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job is not None else None
+
+    def list_jobs(self, kind: Optional[str] = None) -> list[dict]:
+        """Get snapshots of the remembered background jobs, oldest first."""
+        with self._global_lock:
+            return [
+                copy.deepcopy(job) for job in self._jobs.values()
+                if kind is None or job['kind'] == kind
+            ]
+
+    def worker_stats(self, path: Optional[str] = None) -> dict:
+        """Get queue and lock statistics for a collection's worker.
+
+        Args:
+            path: Path to collection. If None, uses the first open collection or the default.
+
+        Returns:
+            Dict with call count, current queue depth, and total/average/max
+            queue and lock wait times in milliseconds
+        """
+        path = self.resolve_path(path)
+        with self._global_lock:
+            stats = dict(self._worker_stats.get(path, {}))
+        calls = stats.get('calls', 0)
+        return {
+            'calls': calls,
+            'queue_depth': stats.get('queue_depth', 0),
+            'queue_wait_avg_ms': round(stats.get('queue_wait_total', 0.0) / calls * 1000, 3) if calls else 0.0,
+            'queue_wait_max_ms': round(stats.get('queue_wait_max', 0.0) * 1000, 3),
+            'lock_wait_avg_ms': round(stats.get('lock_wait_total', 0.0) / calls * 1000, 3) if calls else 0.0,
+            'lock_wait_max_ms': round(stats.get('lock_wait_max', 0.0) * 1000, 3),
+        }
 
     @contextmanager
-    def get_collection(self, path: Optional[str] = None):
+    def get_collection(self, path: Optional[str] = None, read_only: bool = False, track_changes: bool = True):
         """Get a collection with thread-safe access.
 
+        Writers hold the collection's lock exclusively. Readers only keep it
+        from being closed underneath them, so any number of them can use it
+        alongside each other and alongside the writer. When a writer has
+        modified the collection, the write listeners are told on release.
+
         Args:
             path: Path to collection. If None, uses default or first open collection.
+            read_only: The caller won't modify the collection.
+            track_changes: Report the writer's changes to the write
+                listeners (syncs turn this off).
 
         Yields:
             Collection instance
@@ -203,23 +919,477 @@ class CollectionManager:
             >>> with manager.get_collection() as col:
             ...     note = col.new_note(notetype)
         """
-        if path is None:
-            # Try to find an open collection
+        # Resolved before any lock is taken: opening the default collection
+        # may have to close another, waiting on that one's locks
+        path = self.resolve_path(path)
+
+        while True:
+            # Ensure collection is open
+            if path not in self._collections:
+                path = self.open_collection(path)
+
             with self._global_lock:
-                if self._collections:
-                    path = next(iter(self._collections.keys()))
+                col = self._collections.get(path)
+                if col is None:
+                    continue
+                if read_only and self.read_workers:
+                    guard = self._gates[path].shared()
                 else:
-                    # Open default collection
-                    path = self.open_collection()
+                    guard = self._locks[path]
+
+            started = time.perf_counter()
+            with guard:
+                if self._collections.get(path) is not col:
+                    # Closed while we waited; open it again
+                    continue
+                waited = time.perf_counter() - started
+                stats = self._worker_stats.get(path)
+                if stats is not None:
+                    with self._global_lock:
+                        stats['lock_wait_total'] += waited
+                        stats['lock_wait_max'] = max(stats['lock_wait_max'], waited)
+                self._use(path)
+                mod = col.mod if not read_only and track_changes and self._write_listeners else None
+                try:
+                    yield col
+                finally:
+                    self._release(path)
+                    if mod is not None and col.mod != mod:
+                        self._notify_write(path)
+                return
 
-        path = str(Path(path).resolve()) if path else path
+    def get_metadata(self, col: 'Collection') -> dict:
+        """Get cached deck and note type metadata for a collection.
 
-        # Ensure collection is open
-        if path not in self._collections:
-            path = self.open_collection(path)
+        The cache is reused while the collection's modification time is
+        unchanged. When it changes, a single query compares the schema stamp,
+        the count and summed modification times of the decks and note types
+        tables, and the deck, note type and field names themselves, so
+        ordinary note edits don't force a rebuild, while renames are noticed
+        even within the second of an earlier change.
 
-        with self._locks[path]:
-            yield self._collections[path]
+        Args:
+            col: Collection obtained from get_collection (held for reading or writing).
+
+        Returns:
+            Dict with 'decks' (list of (id, name)), 'deck_ids' (casefolded
+            name -> id), 'deck_names' (id -> name), 'notetypes' (id -> note
+            type dict), 'notetype_ids' (casefolded name -> id) and
+            'field_names' (id -> list of field names). Treat it as read-only.
+        """
+        mod = col.mod
+        with self._global_lock:
+            metadata = self._metadata.get(col.path)
+        if metadata is not None and metadata['mod'] == mod:
+            return metadata
+
+        stamp = tuple(col.db.first(
+            "select (select scm from col), "
+            "(select count() from decks), "
+            "(select sum(mtime_secs) from decks), "
+            "(select group_concat(id || ':' || name, char(30)) from (select id, name from decks order by id)), "
+            "(select count() from notetypes), "
+            "(select sum(mtime_secs) from notetypes), "
+            "(select group_concat(id || ':' || name, char(30)) from (select id, name from notetypes order by id)), "
+            "(select group_concat(ntid || ':' || ord || ':' || name, char(30)) "
+            "from (select ntid, ord, name from fields order by ntid, ord))"
+        ))
+        if metadata is not None and metadata['stamp'] == stamp:
+            metadata['mod'] = mod
+            return metadata
+
+        decks = [(deck.id, deck.name) for deck in col.decks.all_names_and_ids()]
+        notetypes = {}
+        for notetype_name_id in col.models.all_names_and_ids():
+            notetypes[notetype_name_id.id] = col.models.get(notetype_name_id.id)
+
+        metadata = {
+            'mod': mod,
+            'stamp': stamp,
+            'decks': decks,
+            'deck_ids': {name.casefold(): did for did, name in decks},
+            'deck_names': dict(decks),
+            'notetypes': notetypes,
+            'notetype_ids': {notetype['name'].casefold(): mid for mid, notetype in notetypes.items()},
+            'field_names': {
+                mid: [field['name'] for field in notetype['flds']]
+                for mid, notetype in notetypes.items()
+            },
+        }
+        with self._global_lock:
+            self._metadata[col.path] = metadata
+        return metadata
+
+    def find_deck_id(self, col: 'Collection', name: str) -> Optional[int]:
+        """Look up a deck ID by name using the metadata cache.
+
+        Falls back to the backend for names the cache doesn't match exactly
+        (Anki's name comparison also normalizes Unicode).
+
+        Returns:
+            Deck ID, or None if no such deck exists
+        """
+        did = self.get_metadata(col)['deck_ids'].get(name.casefold())
+        if did is None:
+            did = col.decks.id_for_name(name)
+        return did or None
+
+    def find_notetype(self, col: 'Collection', name: str) -> Optional[dict]:
+        """Look up a note type by name using the metadata cache.
+
+        Returns:
+            Note type dict (do not modify), or None if no such note type exists
+        """
+        metadata = self.get_metadata(col)
+        mid = metadata['notetype_ids'].get(name.casefold())
+        if mid is None:
+            mid = col.models.id_for_name(name)
+            if not mid:
+                return None
+        return metadata['notetypes'].get(mid) or col.models.get(mid)
+
+    def find_notes_cached(
+        self,
+        col: 'Collection',
+        query: str,
+        order=False,
+        reverse: bool = False
+    ) -> Sequence[int]:
+        """Run a note search, reusing the result while the collection is unchanged.
+
+        Results are cached per collection and keyed on the query and sort
+        order. Entries are discarded as soon as the collection's modification
+        time changes, so paging through a search only runs it once, and when
+        the scheduler's day rolls over, since searches like 'is:due',
+        'rated:1' or 'added:7' are relative to today.
+
+        Args:
+            col: Collection obtained from get_collection (held for reading or writing).
+            query: Anki search query.
+            order: Sort order as accepted by ``Collection.find_notes``.
+            reverse: Reverse the sort order.
+
+        Returns:
+            Sequence of matching note IDs
+        """
+        stamp = (col.mod, col.sched.today)
+        order_key = getattr(order, 'key', order)
+        key = (query, order_key, reverse)
+
+        with self._global_lock:
+            cache = self._search_cache.setdefault(col.path, OrderedDict())
+            entry = cache.get(key)
+            if entry is not None and entry[0] == stamp:
+                cache.move_to_end(key)
+                return entry[1]
+
+        note_ids = col.find_notes(query, order=order, reverse=reverse)
+
+        with self._global_lock:
+            cache[key] = (stamp, note_ids)
+            cache.move_to_end(key)
+            while len(cache) > SEARCH_CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return note_ids
+
+    def get_tag_counts(self, col: 'Collection') -> dict[str, int]:
+        """Get the number of notes carrying each tag, reusing it while the collection is unchanged.
+
+        Counts are built from one scan of the notes table and discarded as
+        soon as the collection's modification time changes. Tags registered
+        in the collection but used by no note are included with a count of 0.
+
+        Args:
+            col: Collection obtained from get_collection (held for reading or writing).
+
+        Returns:
+            Dict mapping tag name to note count, sorted by name. Treat it as read-only.
+        """
+        mod = col.mod
+        with self._global_lock:
+            entry = self._tag_counts.get(col.path)
+        if entry is not None and entry[0] == mod:
+            return entry[1]
+
+        counts: dict[str, int] = {}
+        for (tags,) in col.db.execute("select tags from notes where tags != ''"):
+            for tag in tags.split():
+                counts[tag] = counts.get(tag, 0) + 1
+
+        # Use the registered spelling; notes may differ in case
+        names = {tag.casefold(): tag for tag in col.tags.all()}
+        tag_counts = {name: 0 for name in names.values()}
+        for tag, count in counts.items():
+            name = names.get(tag.casefold(), tag)
+            tag_counts[name] = tag_counts.get(name, 0) + count
+        tag_counts = dict(sorted(tag_counts.items(), key=lambda item: item[0].casefold()))
+
+        with self._global_lock:
+            self._tag_counts[col.path] = (mod, tag_counts)
+        return tag_counts
+
+    def _duplicate_index(self, col: 'Collection') -> dict:
+        """Get the collection's duplicate index, rebuilding it if it's stale (call with _duplicates_lock held)."""
+        mod = col.mod
+        index = self._duplicates.get(col.path)
+        if index is not None and index['mod'] == mod:
+            return index
+
+        started = time.perf_counter()
+        index = {'mod': mod, 'keys': {}, 'notes': {}}
+        last_id = 0
+        while True:
+            # Paged, so only one page of field values is in memory at a time
+            rows = col.db.all(
+                f"select id, mid, {_FIRST_FIELD} from notes where id > ? order by id limit ?",
+                last_id, DUPLICATE_INDEX_PAGE
+            )
+            for nid, mid, first_field in rows:
+                self._index_note(index, nid, duplicate_key(mid, first_field))
+            if len(rows) < DUPLICATE_INDEX_PAGE:
+                break
+            last_id = rows[-1][0]
+        logger.info(f"Built duplicate index of {len(index['keys'])} notes in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        self._duplicates[col.path] = index
+        return index
+
+    @staticmethod
+    def _index_note(index: dict, nid: int, key: Optional[int]):
+        """Move a note to a new key in a duplicate index, or out of it if key is None.
+
+        Most keys belong to a single note, so those map to the note ID
+        itself rather than a list, which halves the index's memory.
+        """
+        keys = index['keys']
+        notes = index['notes']
+        old = keys.pop(nid, None)
+        if old is not None:
+            entry = notes[old]
+            if isinstance(entry, list):
+                entry.remove(nid)
+                if len(entry) == 1:
+                    notes[old] = entry[0]
+            else:
+                del notes[old]
+        if key is None:
+            return
+        keys[nid] = key
+        entry = notes.get(key)
+        if entry is None:
+            notes[key] = nid
+        elif isinstance(entry, list):
+            entry.append(nid)
+        else:
+            notes[key] = [entry, nid]
+
+    def find_duplicate_notes(self, col: 'Collection', mid: int, first_field: str) -> list[int]:
+        """Find the notes a new note would duplicate.
+
+        Uses the collection's duplicate index, which maps every note to its
+        duplicate_key. Writes made through mousetail keep the index current
+        (see update_duplicate_index); any other change to the collection,
+        such as a sync, makes it rebuild from one scan of the notes table
+        the next time it's used.
+
+        Args:
+            col: Collection obtained from get_collection (held for reading or writing).
+            mid: Note type ID.
+            first_field: Value of the first field.
+
+        Returns:
+            IDs of the existing notes with the same note type and first field
+        """
+        with self._duplicates_lock:
+            entry = self._duplicate_index(col)['notes'].get(duplicate_key(mid, first_field))
+        if entry is None:
+            return []
+        return list(entry) if isinstance(entry, list) else [entry]
+
+    def duplicate_groups(self, col: 'Collection') -> list[list[int]]:
+        """Get every group of notes that duplicate each other, from the duplicate index.
+
+        Args:
+            col: Collection obtained from get_collection (held for reading or writing).
+
+        Returns:
+            Lists of two or more note IDs sharing a note type and first field
+        """
+        with self._duplicates_lock:
+            return [list(entry) for entry in self._duplicate_index(col)['notes'].values() if isinstance(entry, list)]
+
+    def update_duplicate_index(self, col: 'Collection', note_ids: Sequence[int], mod_before: int):
+        """Bring the duplicate index up to date after a write.
+
+        Call with the writer lock still held, passing the notes the write
+        added, changed or removed and the collection's modification time
+        from before it. If the index wasn't current before the write, it is
+        left to be rebuilt when next used.
+
+        Args:
+            col: Collection held for writing.
+            note_ids: Notes whose first field may have changed, or that were deleted.
+            mod_before: col.mod read before the write.
+        """
+        from anki.utils import ids2str
+
+        with self._duplicates_lock:
+            index = self._duplicates.get(col.path)
+            if index is None:
+                return
+            if index['mod'] != mod_before:
+                del self._duplicates[col.path]
+                return
+
+            if note_ids:
+                found = {
+                    nid: duplicate_key(mid, first_field)
+                    for nid, mid, first_field in col.db.execute(
+                        f"select id, mid, {_FIRST_FIELD} from notes where id in {ids2str(note_ids)}"
+                    )
+                }
+                # Deleted notes leave the index
+                for nid in note_ids:
+                    self._index_note(index, nid, found.get(nid))
+            index['mod'] = col.mod
+
+    def get_fulltext_index(self, col: 'Collection') -> tuple[FulltextIndex, dict]:
+        """Get the collection's full-text index, brought up to date.
+
+        The sidecar file is opened (and built, if it doesn't exist yet) the
+        first time it's asked for, so collections never searched this way
+        get no index at all.
+
+        Args:
+            col: Collection obtained from get_collection (held for reading or writing).
+
+        Returns:
+            Tuple of (index, refresh stats from FulltextIndex.refresh)
+
+        Raises:
+            RuntimeError: If this Python's SQLite was built without FTS5.
+        """
+        with self._global_lock:
+            index = self._fulltext.get(col.path)
+            if index is None:
+                try:
+                    index = FulltextIndex(col.path)
+                except sqlite3.OperationalError as e:
+                    raise RuntimeError(f"Full-text search needs SQLite with FTS5: {e}")
+                self._fulltext[col.path] = index
+        return index, index.refresh(col)
+
+    def collection_stats(self) -> dict:
+        """Get memory and handle statistics for the open collections.
+
+        Nothing here touches a collection, so it answers immediately even
+        while collections are busy. Memory is reported for the whole process
+        (Anki doesn't expose per-collection usage); per collection the
+        sizes of its files and of the caches this manager keeps are given.
+
+        Returns:
+            Dict with 'process' (rss_bytes, open_files), 'limits' (max_open,
+            idle_close, read_workers) and 'collections' (one dict per open
+            collection with in_use, idle/open seconds, file sizes, open
+            handles, cache sizes and worker stats)
+        """
+        now = time.monotonic()
+        open_files = _open_files()
+        with self._global_lock:
+            paths = list(self._collections)
+            entries = []
+            for path in paths:
+                cache = self._search_cache.get(path, {})
+                metadata = self._metadata.get(path)
+                tag_counts = self._tag_counts.get(path)
+                duplicates = self._duplicates.get(path)
+                fulltext = self._fulltext.get(path)
+                entries.append({
+                    'path': path,
+                    'in_use': self._in_use.get(path, 0),
+                    'idle_seconds': round(now - self._last_used.get(path, now), 1),
+                    'open_seconds': round(now - self._opened_at.get(path, now), 1),
+                    'cache': {
+                        'searches': len(cache),
+                        'search_note_ids': sum(len(entry[1]) for entry in cache.values()),
+                        'decks': len(metadata['decks']) if metadata else 0,
+                        'note_types': len(metadata['notetypes']) if metadata else 0,
+                        'tags': len(tag_counts[1]) if tag_counts else 0,
+                        'duplicate_index_notes': len(duplicates['keys']) if duplicates else 0,
+                        'fulltext_index_notes': fulltext.notes if fulltext else 0,
+                    },
+                })
+
+        for entry in entries:
+            path = entry['path']
+            entry['files'] = {}
+            for suffix in ("", "-wal"):
+                try:
+                    entry['files'][f"collection{suffix}"] = os.path.getsize(path + suffix)
+                except OSError:
+                    pass
+            try:
+                entry['files']['fulltext'] = os.path.getsize(Path(path).with_suffix(SIDECAR_SUFFIX))
+            except OSError:
+                pass
+            if open_files is not None:
+                media = str(Path(path).with_suffix('')) + ".media"
+                entry['handles'] = sum(
+                    1 for f in open_files if f.startswith(path) or f.startswith(media)
+                )
+            entry['worker'] = self.worker_stats(path)
+
+        return {
+            'process': {
+                'rss_bytes': _rss_bytes(),
+                'open_files': len(open_files) if open_files is not None else None,
+            },
+            'limits': {
+                'max_open': self.max_open,
+                'idle_close': self.idle_close,
+                'read_workers': self.read_workers,
+            },
+            'collections': entries,
+        }
+
+    def add_write_listener(self, listener):
+        """Call listener(path) whenever a writer has modified a collection.
+
+        Listeners run on the writer's thread while it still holds the
+        collection, so they must return quickly.
+        """
+        with self._global_lock:
+            self._write_listeners.append(listener)
+
+    def _notify_write(self, path: str):
+        """Tell the write listeners a collection was modified."""
+        for listener in list(self._write_listeners):
+            try:
+                listener(path)
+            except Exception as e:
+                logger.warning(f"Write listener failed for {path}: {e}")
+
+    def get_sync_auth(self, path: str, endpoint: Optional[str], username: str):
+        """Get the remembered sync session for a collection, endpoint and user.
+
+        Returns:
+            SyncAuth from an earlier login, or None
+        """
+        with self._global_lock:
+            return self._sync_auth.get((path, endpoint, username))
+
+    def set_sync_auth(self, path: str, endpoint: Optional[str], username: str, auth):
+        """Remember a sync session (SyncAuth) for later syncs of a collection."""
+        with self._global_lock:
+            self._sync_auth[(path, endpoint, username)] = auth
+
+    def forget_sync_auth(self, path: Optional[str] = None):
+        """Drop remembered sync sessions for a collection, or for all of them."""
+        with self._global_lock:
+            for key in list(self._sync_auth):
+                if path is None or key[0] == path:
+                    del self._sync_auth[key]
 
     def get_collection_info(self, path: Optional[str] = None) -> dict:
         """Get information about a collection.
@@ -230,13 +1400,21 @@ class CollectionManager:
         Returns:
             Dict with collection information
         """
-        with self.get_collection(path) as col:
+        with self.get_collection(path, read_only=True) as col:
+            card_count = col.card_count()
+            note_count = col.note_count()
+            with self._global_lock:
+                self._counts[col.path] = (note_count, card_count)
+            timings = dict(self.timings)
+            timings['open_ms'] = self.timings['open_ms'].get(col.path)
             return {
                 'path': path,
                 'name': col.name(),
-                'card_count': col.card_count(),
-                'note_count': col.note_count(),
+                'card_count': card_count,
+                'note_count': note_count,
                 'is_empty': col.is_empty(),
+                'worker': self.worker_stats(path),
+                'timings': timings,
             }
 
 
@@ -0,0 +1,370 @@
+"""Full-text search index kept in a SQLite FTS5 sidecar file.
+
+Anki's own search scans ``notes.flds`` for substrings and doesn't rank its
+results. The index here holds every note's text, with HTML, cloze markup and
+sound tags removed, in an FTS5 table stored next to the collection
+(``collection.anki2`` gets ``collection.fts5``). Searches are answered from
+that table, ranked by BM25, with the first field weighted above the others.
+
+The same index answers "more like this" lookups (FulltextIndex.similar):
+the most distinctive words of a note are searched for, and the best
+candidates are ranked by the TF-IDF cosine similarity of their text.
+
+The sidecar only ever mirrors the collection. It records the modification
+time of every note it indexed, so it can catch up with changes made while
+it was closed, and it can be deleted at any time; it is rebuilt on next use.
+"""
+
+import heapq
+import html
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from anki.collection import Collection
+
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the sidecar's schema or text extraction changes
+SCHEMA_VERSION = 1
+
+SIDECAR_SUFFIX = ".fts5"
+
+# Notes indexed per query and transaction
+INDEX_PAGE = 5000
+
+# BM25 weights of the first field and of the other fields
+FIRST_FIELD_WEIGHT = 2.0
+OTHER_FIELDS_WEIGHT = 1.0
+
+# Most distinctive words of a note searched for by similar(), and how many of
+# the notes they find are scored
+SIMILAR_TERMS = 25
+SIMILAR_CANDIDATES = 200
+
+# Fraction of notes added or removed before cached document frequencies are dropped
+DF_CACHE_DRIFT = 0.05
+
+_TOKEN = re.compile(r"[^\W_]+")
+_HTML_TAG = re.compile(r"<[^>]*>")
+_CLOZE = re.compile(r"\{\{c\d+::(.*?)(?:::(.*?))?\}\}", re.DOTALL)
+_SOUND = re.compile(r"\[sound:[^\]]*\]")
+
+
+def note_text(field: str) -> str:
+    """Get the searchable text of a field: no HTML, cloze markup or sound tags."""
+    if "{{c" in field:
+        field = _CLOZE.sub(lambda match: " ".join(part for part in match.groups() if part), field)
+    if "[sound:" in field:
+        field = _SOUND.sub(" ", field)
+    if "<" in field:
+        field = _HTML_TAG.sub(" ", field)
+    if "&" in field:
+        field = html.unescape(field)
+    return field
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into terms as the index's tokenizer does: lowercase, without diacritics."""
+    text = text.lower()
+    if not text.isascii():
+        text = "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+    return _TOKEN.findall(text)
+
+
+def _quote_terms(query: str) -> str:
+    """Turn free text into an FTS5 query matching all of its words."""
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class FulltextIndex:
+    """FTS5 sidecar index of one collection's notes.
+
+    Methods must be called with the collection held (for reading or
+    writing); calls are serialized by the index's own lock.
+
+    Attributes:
+        path: Path of the sidecar database.
+        notes: Number of notes indexed.
+    """
+
+    def __init__(self, collection_path: str):
+        """Open (or create) the sidecar of a collection.
+
+        Args:
+            collection_path: Path to the collection file.
+        """
+        self.path = Path(collection_path).with_suffix(SIDECAR_SUFFIX)
+        self.notes = 0
+        self._lock = threading.Lock()
+        self._seen: Optional[tuple] = None
+        self._df: dict[str, int] = {}
+        self._df_notes = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("pragma journal_mode = wal")
+        self._conn.execute("pragma synchronous = normal")
+
+        version = self._conn.execute("pragma user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._conn.executescript(
+                """
+                drop table if exists notes_fts;
+                drop table if exists indexed;
+                create virtual table notes_fts using fts5(
+                    first, rest, tokenize = 'unicode61 remove_diacritics 2'
+                );
+                create table indexed (id integer primary key, mod integer not null);
+                """
+            )
+            self._conn.execute(f"pragma user_version = {SCHEMA_VERSION}")
+            self._conn.commit()
+        # Document frequencies, read straight from the FTS5 index
+        self._conn.execute("create virtual table temp.notes_vocab using fts5vocab(main, notes_fts, 'row')")
+
+    def close(self):
+        """Close the sidecar database."""
+        with self._lock:
+            self._conn.close()
+
+    def refresh(self, col: 'Collection') -> dict:
+        """Bring the index up to date with the collection.
+
+        The first refresh in a process, and the first after a sync, compares
+        every note's modification time with the one indexed, which catches
+        edits, deletions and synced notes of any age. Otherwise only notes
+        modified since the newest one indexed are read, and the result is
+        checked against the note count and the sum of all modification
+        times; if they differ (after a deletion, or an undo or import that
+        set an older modification time), every note is compared after all.
+        Nothing is read at all while the collection's modification time is
+        unchanged.
+
+        Args:
+            col: Collection obtained from get_collection.
+
+        Returns:
+            Dict with 'indexed' and 'removed' (notes updated), 'full'
+            (whether every note was compared) and 'ms'
+        """
+        with self._lock:
+            return self._refresh(col)
+
+    def _refresh(self, col: 'Collection') -> dict:
+        started = time.perf_counter()
+        seen = (col.mod, col.db.scalar("select ls from col"))
+        if seen == self._seen:
+            return {'indexed': 0, 'removed': 0, 'full': False, 'ms': 0.0}
+
+        full = self._seen is None or seen[1] != self._seen[1]
+        digest = tuple(col.db.first("select count(), coalesce(sum(mod), 0) from notes"))
+        indexed_count = removed_count = 0
+        while True:
+            changed, removed = self._full_changes(col) if full else self._recent_changes(col)
+            self._apply(col, changed, removed)
+            indexed_count += len(changed)
+            removed_count += len(removed)
+            indexed = self._conn.execute("select count(), coalesce(sum(mod), 0) from indexed").fetchone()
+            self.notes = indexed[0]
+            # Deletions, and notes whose modification time went back, aren't
+            # among the recent changes
+            if full or indexed == digest:
+                break
+            full = True
+
+        self._seen = seen
+        ms = round((time.perf_counter() - started) * 1000, 1)
+        if indexed_count or removed_count:
+            logger.info(f"Full-text index of {col.path}: {indexed_count} notes indexed, {removed_count} removed in {ms} ms")
+        return {'indexed': indexed_count, 'removed': removed_count, 'full': full, 'ms': ms}
+
+    def _full_changes(self, col: 'Collection') -> tuple[list, list]:
+        """Compare every note's modification time with the indexed one.
+
+        Returns:
+            Tuple of (IDs of notes to index, IDs of notes to remove)
+        """
+        indexed = dict(self._conn.execute("select id, mod from indexed"))
+        changed = []
+        last_id = 0
+        while True:
+            rows = col.db.all(
+                "select id, mod from notes where id > ? order by id limit ?", last_id, INDEX_PAGE * 10
+            )
+            for nid, mod in rows:
+                if indexed.pop(nid, None) != mod:
+                    changed.append(nid)
+            if len(rows) < INDEX_PAGE * 10:
+                break
+            last_id = rows[-1][0]
+        # Whatever is left was deleted
+        return changed, list(indexed)
+
+    def _recent_changes(self, col: 'Collection') -> tuple[list, list]:
+        """Find the notes modified since the newest one indexed.
+
+        Returns:
+            Tuple of (IDs of notes to index, IDs of notes to remove)
+        """
+        newest = self._conn.execute("select coalesce(max(mod), 0) from indexed").fetchone()[0]
+        return col.db.list("select id from notes where mod >= ?", newest), []
+
+    def _apply(self, col: 'Collection', changed: list, removed: list):
+        """Index and remove notes, one transaction per page."""
+        from anki.utils import ids2str
+
+        for start in range(0, len(removed), INDEX_PAGE):
+            chunk = [(nid,) for nid in removed[start:start + INDEX_PAGE]]
+            self._conn.executemany("delete from notes_fts where rowid = ?", chunk)
+            self._conn.executemany("delete from indexed where id = ?", chunk)
+            self._conn.commit()
+
+        for start in range(0, len(changed), INDEX_PAGE):
+            rows = col.db.all(
+                f"select id, mod, flds from notes where id in {ids2str(changed[start:start + INDEX_PAGE])}"
+            )
+            self._conn.executemany("delete from notes_fts where rowid = ?", [(row[0],) for row in rows])
+            self._conn.executemany(
+                "insert into notes_fts (rowid, first, rest) values (?, ?, ?)",
+                [
+                    (nid, note_text(first), note_text(rest.replace("\x1f", "\n")))
+                    for nid, _, flds in rows
+                    for first, _, rest in (flds.partition("\x1f"),)
+                ]
+            )
+            self._conn.executemany("insert or replace into indexed (id, mod) values (?, ?)", [row[:2] for row in rows])
+            self._conn.commit()
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> list[dict]:
+        """Search the index, best matches first.
+
+        The query uses FTS5 syntax (``python AND NOT snake``, ``"exact
+        phrase"``, ``pyth*``, ``first: python``). If it isn't valid FTS5,
+        its words are searched for instead.
+
+        Args:
+            query: FTS5 query or plain words.
+            limit: Maximum number of results, or None for all.
+            offset: Number of results to skip.
+
+        Returns:
+            List of dicts with 'note_id', 'score' (BM25, higher is better)
+            and 'snippet' (matched text in [brackets])
+        """
+        sql = (
+            "select rowid, bm25(notes_fts, ?, ?) as score, "
+            "snippet(notes_fts, -1, '[', ']', '…', 12) "
+            "from notes_fts where notes_fts match ? order by score limit ? offset ?"
+        )
+        weights = (FIRST_FIELD_WEIGHT, OTHER_FIELDS_WEIGHT)
+        limit = -1 if limit is None else limit
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, (*weights, query, limit, offset)).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax: search for its words instead
+                quoted = _quote_terms(query)
+                if not quoted or quoted == query:
+                    raise
+                rows = self._conn.execute(sql, (*weights, quoted, limit, offset)).fetchall()
+        return [
+            {'note_id': nid, 'score': round(-score, 3), 'snippet': snippet}
+            for nid, score, snippet in rows
+        ]
+
+    def similar(
+        self,
+        note_id: Optional[int] = None,
+        text: Optional[str] = None,
+        limit: Optional[int] = 10,
+        candidates: int = SIMILAR_CANDIDATES,
+        allowed: Optional[set] = None
+    ) -> list[dict]:
+        """Find the notes most similar to a note or to some text.
+
+        The notes containing any of the source's SIMILAR_TERMS words with
+        the highest TF-IDF weight are found, and the `candidates` of them
+        sharing the most weight with the source are scored by the cosine
+        similarity of their TF-IDF vectors with the source's.
+
+        Args:
+            note_id: Note to find neighbours of (it is left out of the results).
+            text: Text to find neighbours of, if no note_id is given.
+            limit: Maximum number of results, or None for all candidates.
+            candidates: Number of notes scored.
+            allowed: Only score notes in this set of IDs.
+
+        Returns:
+            List of dicts with 'note_id', 'similarity' (0 to 1) and
+            'first_field' (indexed text of the note's first field), most
+            similar first
+
+        Raises:
+            ValueError: If the note isn't in the index.
+        """
+        with self._lock:
+            if note_id is not None:
+                row = self._conn.execute("select first, rest from notes_fts where rowid = ?", (note_id,)).fetchone()
+                if row is None:
+                    raise ValueError(f"Note {note_id} is not in the full-text index")
+                text = "\n".join(row)
+
+            source = self._tfidf(tokenize(text or ""))
+            if not source:
+                return []
+            # Summing weights over each term's matches is much cheaper than
+            # ranking one OR query with bm25()
+            shared: dict[int, float] = {}
+            for term in sorted(source, key=source.get, reverse=True)[:SIMILAR_TERMS]:
+                weight = source[term]
+                for (nid,) in self._conn.execute("select rowid from notes_fts where notes_fts match ?", (f'"{term}"',)):
+                    shared[nid] = shared.get(nid, 0.0) + weight
+            shared.pop(note_id, None)
+            if allowed is not None:
+                shared = {nid: weight for nid, weight in shared.items() if nid in allowed}
+            best = heapq.nlargest(candidates, shared, key=shared.get)
+            rows = self._conn.execute(
+                f"select rowid, first, rest from notes_fts where rowid in ({','.join(map(str, best))})"
+            ).fetchall()
+
+            source_norm = math.sqrt(sum(weight * weight for weight in source.values()))
+            results = []
+            for nid, first, rest in rows:
+                vector = self._tfidf(tokenize(f"{first}\n{rest}"))
+                norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+                dot = sum(weight * source.get(term, 0.0) for term, weight in vector.items())
+                results.append({
+                    'note_id': nid,
+                    'similarity': round(dot / (source_norm * norm), 3) if norm else 0.0,
+                    'first_field': first
+                })
+
+        results.sort(key=lambda result: result['similarity'], reverse=True)
+        return results if limit is None else results[:limit]
+
+    def _tfidf(self, terms: list[str]) -> dict[str, float]:
+        """Weigh terms by (1 + log tf) * idf (call with the lock held)."""
+        counts = Counter(terms)
+        if abs(self.notes - self._df_notes) > self._df_notes * DF_CACHE_DRIFT:
+            # Frequencies change slowly; a few edits don't warrant re-reading them
+            self._df.clear()
+            self._df_notes = self.notes
+        for term in counts:
+            if term not in self._df:
+                row = self._conn.execute("select doc from notes_vocab where term = ?", (term,)).fetchone()
+                self._df[term] = row[0] if row else 0
+
+        total = self.notes + 1
+        return {
+            term: (1 + math.log(count)) * (math.log(total / (self._df[term] + 1)) + 1)
+            for term, count in counts.items()
+        }